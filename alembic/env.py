@@ -16,7 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 from app.core.config import settings
 from app.core.database import Base
 # Import all models here to ensure they are registered in metadata
-from app.models import User, Role, Permission, Product
+from app.models import User, Role, Permission, RBACVersion, Product, SeederRun
 
 
 # this is the Alebmic Config object, which provides
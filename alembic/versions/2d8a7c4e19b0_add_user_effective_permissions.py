@@ -0,0 +1,35 @@
+"""Add user_effective_permissions table
+
+Revision ID: 2d8a7c4e19b0
+Revises: 9f3e2b61d5a4
+Create Date: 2026-10-18 10:04:17.281946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8a7c4e19b0'
+down_revision: Union[str, None] = '9f3e2b61d5a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_effective_permissions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('permission_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['permission_id'], ['permissions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'permission_id')
+    )
+    op.create_index('ix_user_effective_permissions_permission_id_user_id', 'user_effective_permissions', ['permission_id', 'user_id'], unique=False)
+    # Existing assignments are loaded with: python database/migrate.py backfill
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_effective_permissions_permission_id_user_id', table_name='user_effective_permissions')
+    op.drop_table('user_effective_permissions')
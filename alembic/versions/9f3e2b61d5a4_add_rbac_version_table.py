@@ -0,0 +1,32 @@
+"""Add rbac_version table
+
+Revision ID: 9f3e2b61d5a4
+Revises: 4c7cbc7bd0aa
+Create Date: 2026-10-18 09:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3e2b61d5a4'
+down_revision: Union[str, None] = '4c7cbc7bd0aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    rbac_version = op.create_table('rbac_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # The counter is a single row, seeded here so RBAC writes only ever UPDATE it
+    op.bulk_insert(rbac_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('rbac_version')
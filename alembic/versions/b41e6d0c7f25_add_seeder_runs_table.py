@@ -0,0 +1,31 @@
+"""Add seeder_runs table
+
+Revision ID: b41e6d0c7f25
+Revises: 2d8a7c4e19b0
+Create Date: 2026-10-18 12:40:17.284615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e6d0c7f25'
+down_revision: Union[str, None] = '2d8a7c4e19b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('seeder_runs',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('ran_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seeder_runs')
@@ -0,0 +1,30 @@
+"""Add products search indexes
+
+Revision ID: e7a3c91f4b28
+Revises: b41e6d0c7f25
+Create Date: 2026-10-18 12:40:52.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c91f4b28'
+down_revision: Union[str, None] = 'b41e6d0c7f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_products_price'), 'products', ['price'], unique=False)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ft_products_name_description', 'products', ['name', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_products_name_description', table_name='products')
+    op.drop_index(op.f('ix_products_price'), table_name='products')
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, roles
+from app.core.config import settings
+from app.api.v1.endpoints import users, roles, products, exports, debug
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(roles.router, prefix="/roles", tags=["roles"])
+api_router.include_router(products.router, prefix="/products", tags=["products"])
+api_router.include_router(exports.router, prefix="/export", tags=["export"])
+
+if settings.DEBUG_ENDPOINTS:
+    api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
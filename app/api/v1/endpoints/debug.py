@@ -0,0 +1,59 @@
+from fastapi import APIRouter
+from app.core.count_cache import count_cache
+from app.core.database import pool_status, replica_router
+from app.core.hashing import password_hasher
+from app.core.logging_config import pipeline
+from app.core.response_cache import response_cache
+from app.core.sql_instrumentation import recent_requests
+
+router = APIRouter()
+
+@router.get("/sql")
+async def read_sql_stats(limit: int = 20):
+    """
+    SQL stats of the latest requests served by this worker: statement count,
+    DB time, slowest statements and suspected N+1 patterns.
+    """
+    requests = list(recent_requests)[-limit:] if limit > 0 else []
+    return {"requests": requests[::-1]}
+
+@router.get("/logging")
+async def read_logging_stats():
+    """
+    Log pipeline counters (queued, processed, dropped, sampled out).
+    """
+    return pipeline.stats()
+
+@router.get("/pool")
+async def read_pool_stats():
+    """
+    Connection pool usage: checked-out / idle connections, overflow, checkout wait times.
+    Read replicas are listed with their own pool and health.
+    """
+    status = pool_status()
+    status["replicas"] = [
+        {**health, "pool": pool_status(replica)}
+        for replica, health in zip(replica_router.replicas, replica_router.status())
+    ]
+    return status
+
+@router.get("/hashing")
+async def read_hashing_stats():
+    """
+    Password hashing pool: workers, scrypt parameters, in-flight / waiting jobs, average latency.
+    """
+    return password_hasher.stats()
+
+@router.get("/response-cache")
+async def read_response_cache_stats():
+    """
+    Role GET response cache: entries, hits, misses and 304s served.
+    """
+    return response_cache.stats()
+
+@router.get("/counts")
+async def read_count_cache_stats():
+    """
+    Cached listing totals (X-Total-Count): values, age, approximate flag, hits and misses.
+    """
+    return count_cache.stats()
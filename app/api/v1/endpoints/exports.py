@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from app.schemas.export import ExportFormat
+from app.services.export_service import export_service, MEDIA_TYPES
+
+router = APIRouter()
+
+def _export_response(stmt, name: str, format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        export_service.stream(stmt, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
+
+@router.get("/users")
+async def export_users(format: ExportFormat = ExportFormat.ndjson):
+    """
+    Stream all users (without passwords).
+    """
+    return _export_response(export_service.users_query(), "users", format)
+
+@router.get("/roles")
+async def export_roles(format: ExportFormat = ExportFormat.ndjson):
+    """
+    Stream all roles.
+    """
+    return _export_response(export_service.roles_query(), "roles", format)
+
+@router.get("/role-users")
+async def export_role_users(format: ExportFormat = ExportFormat.ndjson):
+    """
+    Stream all user <-> role assignments.
+    """
+    return _export_response(export_service.role_users_query(), "role_users", format)
+
+@router.get("/role-permissions")
+async def export_role_permissions(format: ExportFormat = ExportFormat.ndjson):
+    """
+    Stream all role <-> permission assignments.
+    """
+    return _export_response(export_service.role_permissions_query(), "role_permissions", format)
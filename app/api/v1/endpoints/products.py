@@ -0,0 +1,54 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_read_db
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.schemas.product import ImportFormat, ProductImportReport, ProductSearchResult
+from app.services.product_service import product_service
+
+router = APIRouter()
+
+@router.get("/search", response_model=List[ProductSearchResult])
+async def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    # authorized: bool = Depends(has_permission("products.view"))
+):
+    """
+    Full-text product search, most relevant first. Pass the X-Next-Cursor
+    response header back as `cursor` for the next page.
+    """
+    after = None
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        score, last_id = position.get("score"), position.get("id")
+        if not isinstance(score, (int, float)) or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (score, last_id)
+
+    products = await product_service.search(
+        db, q, min_price=min_price, max_price=max_price, limit=limit, after=after
+    )
+    if len(products) == limit:
+        last = products[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(score=last.score, id=last.id)
+    return products
+
+@router.post("/import", response_model=ProductImportReport)
+async def import_products(
+    request: Request,
+    format: ImportFormat = ImportFormat.ndjson,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+    # authorized: bool = Depends(has_permission("products.edit"))
+):
+    """
+    Bulk import / update of products from the raw request body (CSV with a header
+    row, or NDJSON), read as it is uploaded. Rows carrying an `id` are upserted.
+    """
+    return await product_service.import_products(db, request.stream(), format, batch_size=batch_size)
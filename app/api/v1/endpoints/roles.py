@@ -1,26 +1,59 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.fieldsets import parse_fieldset
+from app.core.pagination import decode_id_cursor, set_next_cursor, set_total_count
+from app.core.serialization import FastJSONResponse
 from app.core.security import has_permission
-from app.schemas.rbac import RoleCreate, RoleUpdate, RoleResponse
+from app.schemas.rbac import RoleCreate, RoleUpdate, RoleDetailResponse
+from app.schemas.user import UserSummaryResponse
+from app.schemas.rbac import ROLE_FIELDS, ROLE_INCLUDES, role_to_dict
 from app.services.rbac_service import rbac_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[RoleResponse])
+@router.get("/", response_model=List[RoleDetailResponse])
 async def read_roles(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     # authorized: bool = Depends(has_permission("users.view")) # Example permission
 ):
     """
-    Retrieve roles.
+    Retrieve roles. Pass the X-Next-Cursor response header back as `cursor`
+    to page by primary key; `skip` is ignored then.
+    `fields=id,name` / `include=permissions,member_count` narrow what is loaded and returned.
     """
-    return await rbac_service.get_roles(db, skip=skip, limit=limit)
+    selection = parse_fieldset(fields, include, ROLE_FIELDS, ROLE_INCLUDES)
+    total = await rbac_service.count_roles(db)
+    if settings.FAST_JSON_RESPONSES and selection is None:
+        rows = await rbac_service.get_role_rows(db, skip=skip, limit=limit, after_id=decode_id_cursor(cursor))
+        response = FastJSONResponse(rows)
+        set_next_cursor(response, rows, limit)
+        set_total_count(response, total)
+        return response
+    roles = await rbac_service.get_roles(
+        db, skip=skip, limit=limit, after_id=decode_id_cursor(cursor), selection=selection
+    )
+    if selection is None or "member_count" in selection.include:
+        await rbac_service.attach_member_counts(db, roles)
+    if selection is not None:
+        # Partial objects do not fit RoleResponse, send them as-is
+        response = JSONResponse(
+            [role_to_dict(role, selection.fields, selection.include) for role in roles]
+        )
+    set_next_cursor(response, roles, limit)
+    set_total_count(response, total)
+    return roles if selection is None else response
 
-@router.post("/", response_model=RoleResponse)
+@router.post("/", response_model=RoleDetailResponse)
 async def create_role(
     role_in: RoleCreate,
     db: AsyncSession = Depends(get_db),
@@ -37,10 +70,10 @@ async def create_role(
         )
     return await rbac_service.create_role(db=db, role_in=role_in)
 
-@router.get("/{role_id}", response_model=RoleResponse)
+@router.get("/{role_id}", response_model=RoleDetailResponse)
 async def read_role(
     role_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     # authorized: bool = Depends(has_permission("users.view"))
 ):
     """
@@ -49,9 +82,30 @@ async def read_role(
     role = await rbac_service.get_role_by_id(db, role_id=role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
+    await rbac_service.attach_member_counts(db, [role])
     return role
 
-@router.put("/{role_id}", response_model=RoleResponse)
+@router.get("/{role_id}/users", response_model=List[UserSummaryResponse])
+async def read_role_users(
+    role_id: int,
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    # authorized: bool = Depends(has_permission("users.view"))
+):
+    """
+    Members of a role, by user id. Pass the X-Next-Cursor response header back as `cursor`.
+    """
+    users = await rbac_service.get_role_members(db, role_id, limit=limit, after_id=decode_id_cursor(cursor))
+    # Only an empty page needs telling a missing role from one without (more) members
+    if not users and not await rbac_service.role_exists(db, role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+    set_next_cursor(response, users, limit)
+    set_total_count(response, await rbac_service.count_role_members(db, role_id))
+    return users
+
+@router.put("/{role_id}", response_model=RoleDetailResponse)
 async def update_role(
     role_id: int,
     role_in: RoleUpdate,
@@ -64,6 +118,7 @@ async def update_role(
     role = await rbac_service.update_role(db, role_id=role_id, role_in=role_in)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
+    await rbac_service.attach_member_counts(db, [role])
     return role
 
 @router.delete("/{role_id}", response_model=Any)
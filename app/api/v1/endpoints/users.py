@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
-from app.schemas.user import UserCreate, UserResponse
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.fieldsets import parse_fieldset
+from app.core.pagination import decode_id_cursor, set_next_cursor, set_total_count
+from app.core.serialization import FastJSONResponse
+from app.schemas.user import UserCreate, UserResponse, UserBulkCreate, UserBulkCreateResponse
+from app.schemas.user import USER_FIELDS, USER_INCLUDES, user_to_dict
+from app.schemas.rbac import RoleAssignmentBatch, RoleAssignmentBatchResponse
 from app.services.user_service import user_service
+from app.services.rbac_service import rbac_service
 
 router = APIRouter()
 
@@ -18,17 +26,94 @@ async def create_user(
         raise HTTPException(status_code=400, detail="Email already registered")
     return await user_service.create_user(db=db, user=user)
 
+@router.post("/bulk", response_model=UserBulkCreateResponse)
+async def create_users_bulk(
+    payload: UserBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many users with chunked multi-row inserts.
+    Rows whose email already exists are reported per row instead of failing the request.
+    """
+    results = await user_service.create_users_bulk(db, payload.users)
+    created = sum(1 for result in results if result.status == "created")
+    return UserBulkCreateResponse(created=created, failed=len(results) - created, results=results)
+
 @router.get("/", response_model=List[UserResponse])
 async def read_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    permission: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    users = await user_service.get_users(db, skip=skip, limit=limit)
-    return users
+    """
+    Retrieve users. Pass the X-Next-Cursor response header back as `cursor`
+    to page by primary key (constant cost per page); `skip` is ignored then.
+    `fields=id,email` / `include=roles,roles.permissions` return only those
+    columns and relationships, and only those are loaded.
+    """
+    after_id = decode_id_cursor(cursor)
+    selection = parse_fieldset(fields, include, USER_FIELDS, USER_INCLUDES)
+    permission_id = None
+    if permission is not None:
+        # Only users holding this permission (through any of their roles)
+        perm = await rbac_service.get_permission_by_name(db, name=permission)
+        if not perm:
+            raise HTTPException(status_code=404, detail="Permission not found")
+        permission_id = perm.id
+    total = await user_service.count_users(db, permission_id=permission_id)
+    if settings.FAST_JSON_RESPONSES and selection is None:
+        rows = await user_service.get_user_rows(
+            db, skip=skip, limit=limit, permission_id=permission_id, after_id=after_id
+        )
+        response = FastJSONResponse(rows)
+        set_next_cursor(response, rows, limit)
+        set_total_count(response, total)
+        return response
+    users = await user_service.get_users(
+        db, skip=skip, limit=limit, permission_id=permission_id, after_id=after_id, selection=selection
+    )
+    if selection is not None:
+        # Partial objects do not fit UserResponse, send them as-is
+        response = JSONResponse([user_to_dict(user, selection) for user in users])
+    set_next_cursor(response, users, limit)
+    set_total_count(response, total)
+    return users if selection is None else response
 
 # User Role Management
-from app.services.rbac_service import rbac_service # Import here to use RBAC service
+
+@router.post("/roles/batch-assign", response_model=RoleAssignmentBatchResponse)
+async def assign_roles_batch(
+    batch: RoleAssignmentBatch,
+    db: AsyncSession = Depends(get_db),
+    # authorized: bool = Depends(has_permission("users.edit"))
+):
+    """
+    Grant every role in `role_ids` to every user in `user_ids`.
+    Unknown ids and pairs that already exist are skipped; `affected` counts new assignments.
+    """
+    affected = await rbac_service.assign_roles_bulk(db, batch.user_ids, batch.role_ids)
+    return RoleAssignmentBatchResponse(
+        requested=len(set(batch.user_ids)) * len(set(batch.role_ids)), affected=affected
+    )
+
+@router.post("/roles/batch-revoke", response_model=RoleAssignmentBatchResponse)
+async def revoke_roles_batch(
+    batch: RoleAssignmentBatch,
+    db: AsyncSession = Depends(get_db),
+    # authorized: bool = Depends(has_permission("users.edit"))
+):
+    """
+    Remove every role in `role_ids` from every user in `user_ids`; `affected` counts removed assignments.
+    """
+    affected = await rbac_service.revoke_roles_bulk(db, batch.user_ids, batch.role_ids)
+    return RoleAssignmentBatchResponse(
+        requested=len(set(batch.user_ids)) * len(set(batch.role_ids)), affected=affected
+    )
 
 @router.post("/{user_id}/roles/{role_id}", response_model=UserResponse)
 async def assign_role_to_user(
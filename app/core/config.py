@@ -1,3 +1,4 @@
+from typing import List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,6 +6,91 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str
 
+    # Production server (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0 # 0 = one worker process per CPU
+    SERVER_BACKLOG: int = 2048 # Pending connections the listening socket queues
+    SERVER_KEEP_ALIVE: int = 5 # Seconds an idle keep-alive connection stays open
+    SERVER_GRACEFUL_TIMEOUT: int = 30 # Seconds in-flight requests get to finish on SIGTERM
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1" # Proxies trusted for X-Forwarded-* headers
+
+    # Connection pool (per worker)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0 # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800 # Seconds, keep below MySQL wait_timeout
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5 # Connections opened at startup (capped at DB_POOL_SIZE)
+
+    # Read replicas (optional), e.g. '["mysql+aiomysql://ro:pw@replica1:3306/fastapi_db"]'
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_RETRY_AFTER: float = 30.0 # Seconds a failed replica is skipped
+    READ_YOUR_WRITES_WINDOW: float = 5.0 # Seconds a client's reads stay on the primary after a write
+
+    # Logging (see app.core.logging_config)
+    LOG_LEVEL: str = "INFO"
+    LOG_ASYNC: bool = True # Enqueue records, write them from a background thread in batches
+    LOG_JSON: bool = False
+    LOG_QUEUE_SIZE: int = 10000 # Records beyond this are dropped (and counted), never blocking a request
+    LOG_BATCH_SIZE: int = 256
+    LOG_FLUSH_INTERVAL: float = 0.5
+    LOG_SAMPLE_RATE: float = 1.0 # Fraction of DEBUG / LOG_SAMPLED_LOGGERS records kept
+    LOG_SAMPLED_LOGGERS: List[str] = ["fastapi_app.access"]
+
+    # SQL instrumentation (see app.core.sql_instrumentation)
+    SQL_ECHO: bool = False # Dump every statement to stdout (development only)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_STATS_HEADERS: bool = True # X-DB-Query-Count / X-DB-Time-Ms on every response
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10 # Same statement shape repeated more than this in one request
+    SQL_SLOWEST_KEPT: int = 5
+    SQL_STATS_HISTORY: int = 100
+
+    # Mount /api/v1/debug/* (SQL stats, ...). Keep off on public deployments.
+    DEBUG_ENDPOINTS: bool = False
+
+    # GET /users and /roles built from narrow SELECTs and encoded straight to JSON (orjson
+    # when installed), skipping the ORM objects and the response_model pass
+    FAST_JSON_RESPONSES: bool = False
+
+    # Rows per multi-row INSERT in bulk endpoints
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    # Rows fetched per server-side cursor round trip in /export endpoints
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # database/migrate.py SQL file loader
+    SQL_LOAD_BATCH_SIZE: int = 500 # Statements parsed ahead while the previous batch executes
+    SQL_LOAD_COMMIT_EVERY: int = 5000 # Statements per transaction
+    SQL_LOAD_DISABLE_CHECKS: bool = False # MySQL: skip foreign key / unique checks while loading
+    # Product import (POST /products/import, migrate.py import-products)
+    PRODUCT_IMPORT_BATCH_SIZE: int = 1000 # Rows validated and upserted together, one commit each
+    PRODUCT_IMPORT_MAX_ERRORS: int = 100 # Row errors listed in the report (all are counted)
+    PRODUCT_IMPORT_MAX_RECORD_SIZE: int = 1048576 # Characters; a longer line / CSV record is a row error
+    # Independent seeders run at the same time (database/seeding.py)
+    SEEDER_CONCURRENCY: int = 4
+
+    # Password hashing (scrypt in a process pool)
+    PASSWORD_HASH_WORKERS: int = 0 # 0 = one process per CPU
+    PASSWORD_HASH_MAX_PENDING: int = 256 # Jobs handed to the pool at once, further callers wait
+    SCRYPT_N: int = 16384
+    SCRYPT_R: int = 8
+    SCRYPT_P: int = 1
+
+    # RBAC permission cache (per worker)
+    PERMISSION_CACHE_SIZE: int = 10000
+    PERMISSION_CACHE_TTL: float = 300.0
+    # How often a worker checks the shared rbac_version counter (seconds)
+    RBAC_VERSION_POLL_INTERVAL: float = 1.0
+
+    # X-Total-Count of list endpoints (per worker, see app.core.count_cache)
+    COUNT_RECONCILE_INTERVAL: float = 60.0 # Seconds before a cached total is counted again
+    COUNT_APPROXIMATE_ABOVE: int = 0 # MySQL: whole-table totals from table statistics past this many rows (0 = always exact)
+
+    # ETag + response cache for role GETs (per worker, tied to the RBAC version)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_SIZE: int = 512
+
     class Config:
         env_file = ".env"
 
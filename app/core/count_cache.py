@@ -0,0 +1,114 @@
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+
+
+class CountEntry(NamedTuple):
+    value: int
+    counted_at: float
+    approximate: bool = False
+
+
+class CountCache:
+    """
+    Per-worker cache of listing totals ("users", "roles", "role_users:<id>", ...).
+    Writes in this worker adjust the cached value in place; an entry older than
+    `reconcile_after` seconds is counted again on its next read, which bounds the
+    drift left by other workers, seeders and raw SQL.
+    """
+
+    def __init__(self, reconcile_after: float = 60.0, maxsize: int = 10000):
+        self.reconcile_after = reconcile_after
+        self.maxsize = maxsize
+        self._data: Dict[str, CountEntry] = {}
+        # Bumped by every adjustment so a count that raced with a write is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, count: Callable[[], Awaitable[Tuple[int, bool]]]) -> CountEntry:
+        """Cached total for `key`; `count()` returns (value, approximate) on a miss."""
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry.counted_at < self.reconcile_after:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        generation = self.generation
+        value, approximate = await count()
+        entry = CountEntry(value, now, approximate)
+        if generation == self.generation and self.maxsize > 0:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = entry
+        return entry
+
+    def adjust(self, key: str, delta: int) -> None:
+        """Applies a committed insert / delete to a cached exact total."""
+        self.generation += 1
+        entry = self._data.get(key)
+        if entry is not None and not entry.approximate:
+            self._data[key] = entry._replace(value=max(entry.value + delta, 0))
+
+    def invalidate(self, key: Optional[str] = None, prefix: Optional[str] = None) -> None:
+        self.generation += 1
+        if key is not None:
+            self._data.pop(key, None)
+        if prefix is not None:
+            for stale in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[stale]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reconcile_after_s": self.reconcile_after,
+            "counts": {
+                key: {"value": entry.value, "approximate": entry.approximate, "age_s": round(now - entry.counted_at, 1)}
+                for key, entry in self._data.items()
+            },
+        }
+
+
+async def table_row_estimate(db: AsyncSession, table_name: str) -> Optional[int]:
+    """InnoDB's row estimate from table statistics (MySQL only): no scan, but can be off by tens of percent."""
+    if db.bind.dialect.name != "mysql":
+        return None
+    result = await db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+        ),
+        {"name": table_name},
+    )
+    return result.scalar()
+
+
+async def count_table(db: AsyncSession, table) -> Tuple[int, bool]:
+    """
+    (rows, approximate) of a whole table: the statistics estimate once it reaches
+    COUNT_APPROXIMATE_ABOVE rows, an exact COUNT(*) below that (or when disabled).
+    """
+    threshold = settings.COUNT_APPROXIMATE_ABOVE
+    if threshold > 0:
+        estimate = await table_row_estimate(db, table.name)
+        if estimate is not None and estimate >= threshold:
+            return int(estimate), True
+    result = await db.execute(select(func.count()).select_from(table))
+    return result.scalar_one(), False
+
+
+# Singleton instance
+count_cache = CountCache(reconcile_after=settings.COUNT_RECONCILE_INTERVAL)
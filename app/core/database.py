@@ -1,13 +1,71 @@
+import asyncio
+import importlib
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional, Sequence
+from fastapi import Request
+from sqlalchemy import event, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.sql_instrumentation import instrument_engine
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """QueuePool that also records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+def _engine_options(url: str) -> dict:
+    """Pool settings from Settings; in-memory SQLite keeps its default single-connection pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def create_engine_for(url: str):
+    """Async engine with the configured pool and SQL instrumentation."""
+    new_engine = create_async_engine(
+        url,
+        echo=settings.SQL_ECHO, # Per-request stats come from app.core.sql_instrumentation instead
+        future=True,
+        **_engine_options(url),
+    )
+    if settings.SQL_INSTRUMENTATION:
+        instrument_engine(new_engine)
+    return new_engine
 
 # Create Async Engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True, # Set to False in production
-    future=True
-)
+engine = create_engine_for(settings.DATABASE_URL)
 
 # Create Async Session Factory
 SessionLocal = sessionmaker(
@@ -27,3 +85,223 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas. A replica whose connection fails is skipped
+    for REPLICA_RETRY_AFTER seconds; with no healthy replica reads go to the primary.
+    """
+
+    def __init__(self, replicas, retry_after: float):
+        self.replicas = list(replicas)
+        self.retry_after = retry_after
+        self._down_until = {}
+        self._next = itertools.count()
+        for replica in self.replicas:
+            event.listen(replica.sync_engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica):
+        def listener(exception_context):
+            if exception_context.is_disconnect:
+                self.mark_down(replica)
+        return listener
+
+    def mark_down(self, replica) -> None:
+        self._down_until[replica] = time.monotonic() + self.retry_after
+
+    def candidates(self):
+        """Healthy replicas, starting at the next one in round-robin order."""
+        if not self.replicas:
+            return []
+        now = time.monotonic()
+        start = next(self._next) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if self._down_until.get(replica, 0) <= now]
+
+    def reset(self) -> None:
+        self._down_until.clear()
+
+    def status(self) -> list:
+        now = time.monotonic()
+        return [
+            {"url": replica.url.render_as_string(hide_password=True), "healthy": self._down_until.get(replica, 0) <= now}
+            for replica in self.replicas
+        ]
+
+replica_router = ReplicaRouter(
+    (create_engine_for(url) for url in settings.DATABASE_REPLICA_URLS),
+    retry_after=settings.REPLICA_RETRY_AFTER,
+)
+
+# Read-your-writes: clients that just wrote carry this cookie and read from the primary
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+# request.state flag set by middlewares that need the request read from the primary
+READ_FROM_PRIMARY_STATE = "read_from_primary"
+
+def is_sticky_to_primary(cookies) -> bool:
+    """True while the read-your-writes cookie of a recent write is still valid."""
+    sticky_until = cookies.get(PRIMARY_STICKY_COOKIE)
+    try:
+        return sticky_until is not None and float(sticky_until) > time.time()
+    except ValueError:
+        return False
+
+@asynccontextmanager
+async def read_session(stick_to_primary: bool = False):
+    """
+    Session for read-only work, bound to a healthy replica (the primary if none
+    is configured or reachable). The connection is opened up front so a dead
+    replica is detected here and the next one is tried.
+    """
+    if not stick_to_primary:
+        for replica in replica_router.candidates():
+            session = SessionLocal(bind=replica)
+            try:
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                replica_router.mark_down(replica)
+                continue
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with SessionLocal() as session:
+        yield session
+
+# Dependency to get a read-only DB session (GET handlers)
+async def get_read_db(request: Request):
+    stick_to_primary = (
+        is_sticky_to_primary(request.cookies) or getattr(request.state, READ_FROM_PRIMARY_STATE, False)
+    )
+    async with read_session(stick_to_primary=stick_to_primary) as session:
+        yield session
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write (POST/PUT/PATCH/DELETE) the client gets a short-lived
+    cookie that pins its reads to the primary, hiding replica lag from it.
+    """
+
+    WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                cookie = f"{PRIMARY_STICKY_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+async def warm_up_pool(target_engine=None, connections: Optional[int] = None) -> int:
+    """
+    Opens `connections` (DB_POOL_WARMUP) connections at once and returns them to
+    the pool idle, so the first requests after a deploy do not pay for the handshakes.
+    Failed connections are logged; if none opens the first error is raised, so a
+    worker that cannot reach the database fails at startup.
+    """
+    target_engine = target_engine or engine
+    if connections is None:
+        connections = settings.DB_POOL_WARMUP
+    connections = min(connections, getattr(target_engine.pool, "size", lambda: 1)())
+    if connections <= 0:
+        return 0
+
+    opened = await asyncio.gather(
+        *(target_engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    ready = [conn for conn in opened if not isinstance(conn, BaseException)]
+    failures = [error for error in opened if isinstance(error, BaseException)]
+    for conn in ready:
+        await conn.close()
+    for error in failures:
+        logger.warning(f"Pool warm-up: connection failed: {error!r}")
+    if failures and not ready:
+        raise failures[0]
+    return len(ready)
+
+async def dispose_engines(close: bool = True) -> None:
+    """
+    Drops the pools of the primary and replica engines. `close=False` only forgets
+    the connections: used in a freshly forked worker, whose inherited sockets
+    still belong to the parent process.
+    """
+    await engine.dispose(close=close)
+    for replica in replica_router.replicas:
+        await replica.dispose(close=close)
+
+def pool_status(target_engine=None) -> dict:
+    """Snapshot of pool usage: checked-out / idle connections, overflow and checkout waits."""
+    target_engine = target_engine or engine
+    pool = target_engine.pool
+    status = {"pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update({
+            "checkouts": pool.checkouts,
+            "checkout_timeouts": pool.timeouts,
+            "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "wait_max_ms": round(pool.wait_max * 1000, 3),
+        })
+    return status
+
+def insert_ignore(table):
+    """INSERT that skips rows colliding with a primary/unique key (MySQL `INSERT IGNORE`)."""
+    return insert(table).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+
+async def upsert(
+    db: AsyncSession,
+    table,
+    rows: Iterable[dict],
+    key: Sequence[str],
+    update: Sequence[str] = (),
+    chunk_size: Optional[int] = None,
+) -> None:
+    """
+    Multi-row insert of `rows`; rows colliding on the unique `key` get their
+    `update` columns overwritten (or are skipped when `update` is empty).
+    MySQL: INSERT ... ON DUPLICATE KEY UPDATE, SQLite / PostgreSQL: ON CONFLICT.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+    dialect = db.bind.dialect.name
+
+    if not update:
+        stmt = insert_ignore(table)
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update})
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_insert = importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key), set_={column: stmt.excluded[column] for column in update}
+        )
+    else:
+        stmt = insert(table)
+
+    for start in range(0, len(rows), chunk_size):
+        await db.execute(stmt, rows[start:start + chunk_size])
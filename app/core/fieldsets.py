@@ -0,0 +1,49 @@
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+
+class FieldSelection(NamedTuple):
+    """Columns and relationships requested through `fields=` / `include=`."""
+    fields: Tuple[str, ...]
+    include: FrozenSet[str]
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+def parse_fieldset(
+    fields: Optional[str],
+    include: Optional[str],
+    allowed_fields: Sequence[str],
+    allowed_includes: Sequence[str],
+) -> Optional[FieldSelection]:
+    """
+    Parses comma separated `fields` / `include` query values.
+    Returns None when neither is given (full legacy response). Missing `fields`
+    means every scalar field; missing `include` means no relationship at all.
+    Nested includes ("roles.permissions") imply their parent ("roles").
+    """
+    if fields is None and include is None:
+        return None
+
+    selected = _split(fields) if fields is not None else tuple(allowed_fields)
+    unknown = [name for name in selected if name not in allowed_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    included = set(_split(include)) if include is not None else set()
+    unknown = [name for name in included if name not in allowed_includes]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
+    for name in list(included):
+        while "." in name:
+            name = name.rsplit(".", 1)[0]
+            included.add(name)
+
+    return FieldSelection(fields=selected, include=frozenset(included))
+
+
+def pick(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name in fields}
@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Suffix used by the placeholder "hash" stored before scrypt was introduced
+LEGACY_SUFFIX = "notreallyhashed"
+
+SCHEME = "scrypt"
+DKLEN = 64
+
+
+class ScryptParams(NamedTuple):
+    n: int
+    r: int
+    p: int
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, params: ScryptParams) -> bytes:
+    # Runs in a worker process: module level so it can be pickled
+    n, r, p = params
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, dklen=DKLEN, maxmem=128 * r * (n + p) + 1024 * 1024
+    )
+
+
+def _parse(stored: str) -> Optional[Tuple[ScryptParams, bytes, bytes]]:
+    """`scrypt$n$r$p$salt$hash` -> (params, salt, hash); None for any other format."""
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return None
+    try:
+        params = ScryptParams(int(parts[1]), int(parts[2]), int(parts[3]))
+        return params, _unb64(parts[4]), _unb64(parts[5])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """
+    scrypt hashing / verification in a process pool, so a ~50 ms KDF never runs on
+    the event loop and throughput scales with cores.
+    At most `max_pending` jobs are handed to the pool; further callers wait for a
+    slot (backpressure) instead of growing the executor's unbounded queue.
+    """
+
+    def __init__(self, params: ScryptParams, workers: int = 0, max_pending: int = 256):
+        self.params = params
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_pending)
+        # Metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.wait_max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the parent runs threads (log writer, event loop), fork is unsafe with them
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, password: str, salt: bytes, params: ScryptParams) -> bytes:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.wait_max = max(self.wait_max, time.perf_counter() - queued_at)
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                result = await loop.run_in_executor(executor, _scrypt, password, salt, params)
+            except BrokenProcessPool:
+                # A worker died (OOM kill...): release the broken pool (once, other jobs
+                # may have failed with it too), start a fresh one and retry once
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                result = await loop.run_in_executor(self._get_executor(), _scrypt, password, salt, params)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.latency_total += time.perf_counter() - started
+            self.in_flight -= 1
+            self._slots.release()
+
+    def _encode(self, params: ScryptParams, salt: bytes, digest: bytes) -> str:
+        return f"{SCHEME}${params.n}${params.r}${params.p}${_b64(salt)}${_b64(digest)}"
+
+    async def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        digest = await self._run(password, salt, self.params)
+        return self._encode(self.params, salt, digest)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hashes in parallel across the pool, results in input order."""
+        return list(await asyncio.gather(*(self.hash(password) for password in passwords)))
+
+    async def verify(self, password: str, stored: str) -> Tuple[bool, bool]:
+        """Returns (valid, needs_rehash). Legacy placeholder hashes always need a rehash."""
+        parsed = _parse(stored)
+        if parsed is None:
+            valid = stored.endswith(LEGACY_SUFFIX) and hmac.compare_digest(
+                stored.encode("utf-8"), (password + LEGACY_SUFFIX).encode("utf-8")
+            )
+            return valid, valid
+
+        params, salt, expected = parsed
+        digest = await self._run(password, salt, params)
+        valid = hmac.compare_digest(digest, expected)
+        return valid, valid and params != self.params
+
+    def needs_rehash(self, stored: str) -> bool:
+        parsed = _parse(stored)
+        return parsed is None or parsed[0] != self.params
+
+    def stats(self) -> dict:
+        return {
+            "scheme": SCHEME,
+            "params": self.params._asdict(),
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_latency_ms": round(self.latency_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+    def reset(self) -> None:
+        """Forgets a pool inherited across fork (its processes belong to the parent); a new one starts on demand."""
+        self._executor = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+password_hasher = PasswordHasher(
+    ScryptParams(settings.SCRYPT_N, settings.SCRYPT_R, settings.SCRYPT_P),
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,172 @@
+import asyncio
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, NamedTuple, Optional
+
+
+# Longest record (in characters) buffered while waiting for its end
+MAX_RECORD_SIZE = 1 << 20
+
+
+class ParsedRecord(NamedTuple):
+    row: int # 1-based data row
+    data: Optional[dict]
+    error: Optional[str] = None
+
+
+class RecordParser:
+    """
+    Incremental CSV / NDJSON parser: `feed()` bytes as they arrive, in chunks of
+    any size, and get back the records completed so far. Only the current
+    partial line (or CSV record spanning lines) is buffered, up to
+    `max_record_size` characters: a longer record is reported as a row error and
+    parsing resumes at the next line.
+    CSV needs a header row; quoted values may contain commas and newlines.
+    """
+
+    def __init__(self, csv_format: bool, encoding: str = "utf-8-sig", max_record_size: int = MAX_RECORD_SIZE):
+        self.csv_format = csv_format
+        self.max_record_size = max_record_size
+        self.row = 0
+        # utf-8-sig drops the byte order mark Excel puts in front of CSV exports
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._pending = ""
+        self._header: Optional[List[str]] = None
+        # Physical lines of a CSV record whose quoted value is still open
+        self._record: List[str] = []
+        self._record_size = 0
+        self._in_quotes = False
+        # Dropping the rest of an oversized line
+        self._skipping = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[ParsedRecord]:
+        records: List[ParsedRecord] = []
+        text = self._decoder.decode(data, final)
+        if self._skipping:
+            newline = text.find("\n")
+            if newline < 0:
+                self._skipping = not final
+                text = ""
+            else:
+                self._skipping = False
+                text = text[newline + 1:]
+        text = self._pending + text
+        lines = text.split("\n")
+        self._pending = "" if final else lines.pop()
+        for line in lines:
+            self._line(line.rstrip("\r"), records)
+        if self._record_size + len(self._pending) > self.max_record_size:
+            self._pending = ""
+            self._skipping = not final
+            self._oversized(records)
+        if final and self._record:
+            self.row += 1
+            records.append(ParsedRecord(self.row, None, "Unterminated quoted value"))
+            self._reset_record()
+        return records
+
+    def _reset_record(self) -> None:
+        self._record, self._record_size, self._in_quotes = [], 0, False
+
+    def _oversized(self, records: List[ParsedRecord]) -> None:
+        self.row += 1
+        records.append(ParsedRecord(self.row, None, f"Record longer than {self.max_record_size} characters"))
+        self._reset_record()
+
+    def _ends_quoted(self, line: str) -> bool:
+        """
+        Whether a quoted value is still open at the end of `line`. As in the csv
+        module, only a quote opening a field starts a quoted value (`12" pipe` is
+        plain text); inside one a doubled quote is a literal quote.
+        """
+        in_quotes = self._in_quotes
+        # A continuation line starts inside the quoted value of the previous one
+        field_start = not in_quotes
+        i, end = 0, len(line)
+        while i < end:
+            if in_quotes:
+                quote = line.find('"', i)
+                if quote < 0:
+                    return True
+                if line.startswith('"', quote + 1):
+                    i = quote + 2
+                else:
+                    in_quotes = False
+                    i = quote + 1
+            elif field_start and line[i] == '"':
+                in_quotes, field_start = True, False
+                i += 1
+            else:
+                comma = line.find(",", i)
+                if comma < 0:
+                    return False
+                field_start = True
+                i = comma + 1
+        return in_quotes
+
+    def _line(self, line: str, records: List[ParsedRecord]) -> None:
+        if not self.csv_format:
+            if not line.strip():
+                return
+            self.row += 1
+            if len(line) > self.max_record_size:
+                records.append(ParsedRecord(self.row, None, f"Record longer than {self.max_record_size} characters"))
+                return
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                records.append(ParsedRecord(self.row, None, f"Invalid JSON: {e}"))
+                return
+            if isinstance(data, dict):
+                records.append(ParsedRecord(self.row, data))
+            else:
+                records.append(ParsedRecord(self.row, None, "Expected a JSON object"))
+            return
+
+        self._record.append(line)
+        self._record_size += len(line) + 1
+        if self._record_size > self.max_record_size:
+            self._oversized(records)
+            return
+        self._in_quotes = ('"' in line or self._in_quotes) and self._ends_quoted(line)
+        if self._in_quotes:
+            return
+        text = "\n".join(self._record)
+        self._reset_record()
+        if not text.strip():
+            return
+
+        values = next(csv.reader([text]))
+        if self._header is None:
+            self._header = [name.strip().lower() for name in values]
+            return
+        self.row += 1
+        if len(values) != len(self._header):
+            records.append(ParsedRecord(
+                self.row, None, f"Expected {len(self._header)} columns, got {len(values)}"
+            ))
+        else:
+            records.append(ParsedRecord(self.row, dict(zip(self._header, values))))
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], csv_format: bool, max_record_size: int = MAX_RECORD_SIZE
+) -> AsyncIterator[ParsedRecord]:
+    """Records of a byte stream (an upload, a file read in chunks...), parsed as the bytes arrive."""
+    parser = RecordParser(csv_format, max_record_size=max_record_size)
+    async for chunk in chunks:
+        for record in parser.feed(chunk):
+            yield record
+    for record in parser.feed(b"", final=True):
+        yield record
+
+
+async def iter_file(path: str, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    """A local file as a byte stream, read off the event loop."""
+    with open(path, "rb") as f:
+        while True:
+            data = await asyncio.to_thread(f.read, chunk_size)
+            if not data:
+                return
+            yield data
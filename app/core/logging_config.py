@@ -1,12 +1,192 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
-from datetime import datetime
+import queue
+import random
+import threading
+from logging.handlers import BaseRotatingHandler, QueueHandler, TimedRotatingFileHandler
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, `extra=` fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a `rate` fraction of high-volume records: DEBUG lines and
+    anything logged under one of `loggers` (e.g. "fastapi_app.access").
+    """
+
+    def __init__(self, rate: float, loggers=()):
+        super().__init__()
+        self.rate = rate
+        self.loggers = tuple(loggers)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0:
+            return True
+        if record.levelno > logging.DEBUG and not record.name.startswith(self.loggers):
+            return True
+        if random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped (and counted) when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener:
+    """
+    Background thread draining the log queue in batches: each handler writes
+    the whole batch and flushes once, rollover included, off the event loop.
+    """
+
+    _STOP = None
+
+    def __init__(self, log_queue: queue.Queue, handlers, batch_size: int = 256, flush_interval: float = 0.5):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.processed = 0
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Writes out everything still queued, then stops the thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._STOP in batch
+            records = [record for record in batch if record is not self._STOP]
+            if records:
+                for handler in self.handlers:
+                    self._emit_batch(handler, records)
+                self.processed += len(records)
+            if stopping:
+                return
+
+    def _emit_batch(self, handler: logging.Handler, records) -> None:
+        if not isinstance(handler, logging.StreamHandler):
+            for record in records:
+                handler.handle(record)
+            return
+
+        handler.acquire()
+        try:
+            for record in records:
+                if record.levelno < handler.level or not handler.filter(record):
+                    continue
+                try:
+                    if isinstance(handler, BaseRotatingHandler) and handler.stream and handler.shouldRollover(record):
+                        handler.doRollover()
+                    if handler.stream is None:
+                        # File not opened yet (delay=True) or closed by the rollover: emit() opens it
+                        handler.emit(record)
+                        continue
+                    handler.stream.write(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+            handler.flush()
+        finally:
+            handler.release()
+
+
+class LoggingPipeline:
+    """Handles on the running pipeline, for shutdown and stats."""
+
+    def __init__(self):
+        self.listener = None
+        self.queue_handler = None
+        self.sampler = None
+
+    def stop(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+
+    def restart_after_fork(self) -> None:
+        """
+        Threads do not survive fork: a forked worker starts its own writer thread,
+        on a fresh queue (the parent's thread may have held the old queue's lock).
+        """
+        if self.listener is not None:
+            fresh = queue.Queue(maxsize=self.queue_handler.queue.maxsize)
+            self.queue_handler.queue = self.listener.queue = fresh
+            self.listener._thread = None
+            self.listener.start()
+
+    def stats(self) -> dict:
+        return {
+            "async": self.listener is not None,
+            "queued": self.queue_handler.queue.qsize() if self.queue_handler else 0,
+            "processed": self.listener.processed if self.listener else None,
+            "dropped": self.queue_handler.dropped if self.queue_handler else 0,
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+        }
+
+pipeline = LoggingPipeline()
 
 def setup_logging():
     """
     Configures the Global Logger to write to daily files.
     Structure: logs/YYYY-MM-DD.log
+    With LOG_ASYNC (default) the request path only enqueues records; a
+    background thread writes them in batches (see BatchQueueListener).
     """
     # Create logs directory if not exists
     log_dir = "logs"
@@ -15,20 +195,23 @@ def setup_logging():
 
     # Base logger
     logger = logging.getLogger("fastapi_app")
-    logger.setLevel(logging.INFO)
+    logger.setLevel(settings.LOG_LEVEL)
 
     # Format
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    if settings.LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
 
     # Handler: Daily Rotation
     # filename will be the prefix, usually appended with current date by the handler
     # But TimedRotatingFileHandler appends suffix automatically.
-    # To get precise "YYYY-MM-DD.log" naming requires some customization or 
+    # To get precise "YYYY-MM-DD.log" naming requires some customization or
     # relying on the default suffixing "app.log.YYYY-MM-DD".
     # Let's use a standard "app.log" that rotates.
-    
+
     file_handler = TimedRotatingFileHandler(
         filename=os.path.join(log_dir, "app.log"),
         when="midnight",
@@ -38,13 +221,32 @@ def setup_logging():
     )
     file_handler.suffix = "%Y-%m-%d"
     file_handler.setFormatter(formatter)
-    
+
     # Console Handler (so we still see output in terminal)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    pipeline.sampler = SamplingFilter(settings.LOG_SAMPLE_RATE, settings.LOG_SAMPLED_LOGGERS)
+
+    if settings.LOG_ASYNC:
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        pipeline.queue_handler = DroppingQueueHandler(log_queue)
+        pipeline.queue_handler.addFilter(pipeline.sampler)
+        pipeline.listener = BatchQueueListener(
+            log_queue,
+            [file_handler, console_handler],
+            batch_size=settings.LOG_BATCH_SIZE,
+            flush_interval=settings.LOG_FLUSH_INTERVAL,
+        )
+        pipeline.listener.start()
+        atexit.register(pipeline.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=pipeline.restart_after_fork)
+        logger.addHandler(pipeline.queue_handler)
+    else:
+        for handler in (file_handler, console_handler):
+            handler.addFilter(pipeline.sampler)
+            logger.addHandler(handler)
 
     return logger
 
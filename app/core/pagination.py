@@ -0,0 +1,53 @@
+import base64
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_APPROXIMATE_HEADER = "X-Total-Count-Approximate"
+
+
+def encode_cursor(**position: Any) -> str:
+    """Opaque cursor for keyset pagination, e.g. encode_cursor(id=42)."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        position = None
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def decode_id_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Last seen primary key carried by a cursor built with encode_cursor(id=...)."""
+    if cursor is None:
+        return None
+    last_id = decode_cursor(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+def set_total_count(response: Response, total) -> None:
+    """X-Total-Count from a CountEntry; estimates from table statistics are flagged."""
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    if total.approximate:
+        response.headers[TOTAL_COUNT_APPROXIMATE_HEADER] = "true"
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """
+    Exposes the cursor of the next page in the X-Next-Cursor header (items are
+    ORM objects or dicts). A short page means there is nothing left, so no header is sent.
+    """
+    if limit > 0 and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(id=last["id"] if isinstance(last, dict) else last.id)
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class EffectivePermissions(NamedTuple):
+    """Flattened RBAC view of a single user."""
+    permissions: FrozenSet[str]
+    roles: FrozenSet[str]
+    role_ids: FrozenSet[int]
+    # OR of the role masks from the compiled RBAC snapshot (see app.core.rbac_graph)
+    permission_mask: int = 0
+    # Version of the snapshot the mask was compiled against
+    rbac_version: int = 0
+
+
+class PermissionCache:
+    """
+    In-process LRU + TTL cache: user_id -> EffectivePermissions.
+    Each worker keeps its own copy, RBACService invalidates entries on writes.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[int, Tuple[float, EffectivePermissions]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced with a write is not stored
+        self.generation = 0
+
+    def get(self, user_id: int) -> Optional[EffectivePermissions]:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return value
+
+    def set(self, user_id: int, value: EffectivePermissions, generation: Optional[int] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[user_id] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.pop(user_id, None)
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            self.generation += 1
+            for user_id in user_ids:
+                self._data.pop(user_id, None)
+
+    def invalidate_role(self, role_id: int) -> None:
+        # Scans at most `maxsize` entries, no need to ask the DB who holds the role
+        with self._lock:
+            self.generation += 1
+            stale = [uid for uid, (_, value) in self._data.items() if role_id in value.role_ids]
+            for user_id in stale:
+                del self._data[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Singleton instance
+permission_cache = PermissionCache(
+    maxsize=settings.PERMISSION_CACHE_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL,
+)
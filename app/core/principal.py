@@ -0,0 +1,32 @@
+from typing import FrozenSet, NamedTuple, Optional
+
+from app.core.permission_cache import EffectivePermissions
+
+
+class Principal(NamedTuple):
+    """
+    Lightweight authenticated user used by the security dependencies.
+    Holds only the user columns the guards need plus the flattened RBAC sets,
+    never the ORM graph.
+    """
+    id: int
+    email: str
+    is_active: Optional[bool]
+    is_superuser: Optional[bool]
+    effective: EffectivePermissions
+
+    @property
+    def permissions(self) -> FrozenSet[str]:
+        return self.effective.permissions
+
+    @property
+    def roles(self) -> FrozenSet[str]:
+        return self.effective.roles
+
+    @property
+    def permission_mask(self) -> int:
+        return self.effective.permission_mask
+
+    @property
+    def rbac_version(self) -> int:
+        return self.effective.rbac_version
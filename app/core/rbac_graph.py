@@ -0,0 +1,121 @@
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.permission_cache import permission_cache
+from app.models.rbac import Permission, RBACVersion, permission_role
+
+RBAC_VERSION_ROW_ID = 1
+
+
+class RBACSnapshot:
+    """
+    Compiled, read-only view of the whole role/permission graph.
+    Every permission owns one bit (dense indexes 0..N-1 in id order, so masks stay
+    N bits wide whatever the primary keys), every role is the OR of its permission
+    bits, so checking N permissions is a single AND. Masks are only meaningful
+    against the snapshot (version) they were compiled with.
+    """
+
+    def __init__(self, version: int, permission_ids: Dict[str, int], role_permissions: Dict[int, List[int]]):
+        self.version = version
+        self.permission_ids = permission_ids
+        self.permission_bits = {
+            name: bit for bit, (name, _) in enumerate(sorted(permission_ids.items(), key=lambda item: item[1]))
+        }
+        self.permission_names = {bit: name for name, bit in self.permission_bits.items()}
+        bit_of_id = {perm_id: self.permission_bits[name] for name, perm_id in permission_ids.items()}
+        self.role_masks: Dict[int, int] = {}
+        for role_id, perm_ids in role_permissions.items():
+            mask = 0
+            for perm_id in perm_ids:
+                mask |= 1 << bit_of_id[perm_id]
+            self.role_masks[role_id] = mask
+
+    def required_mask(self, perm_names: Iterable[str]) -> Optional[int]:
+        """Mask for the given permission names, None if one of them does not exist."""
+        mask = 0
+        for name in perm_names:
+            bit = self.permission_bits.get(name)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def roles_mask(self, role_ids: Iterable[int]) -> int:
+        mask = 0
+        for role_id in role_ids:
+            mask |= self.role_masks.get(role_id, 0)
+        return mask
+
+    def names_for(self, mask: int) -> FrozenSet[str]:
+        names = set()
+        while mask:
+            low_bit = mask & -mask
+            name = self.permission_names.get(low_bit.bit_length() - 1)
+            if name is not None:
+                names.add(name)
+            mask ^= low_bit
+        return frozenset(names)
+
+
+class RBACGraph:
+    """
+    Per-worker holder of the current RBACSnapshot.
+    The shared `rbac_version` counter is polled at most every `poll_interval`
+    seconds; a changed version triggers a one-query rebuild and drops the
+    per-user permission cache, whose masks were compiled against the old graph.
+    """
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self.snapshot: Optional[RBACSnapshot] = None
+        self._checked_at = 0.0
+
+    async def get_snapshot(self, db: AsyncSession) -> RBACSnapshot:
+        now = time.monotonic()
+        if self.snapshot is not None and now - self._checked_at < self.poll_interval:
+            return self.snapshot
+
+        result = await db.execute(select(RBACVersion.version).where(RBACVersion.id == RBAC_VERSION_ROW_ID))
+        version = result.scalar() or 0
+        if self.snapshot is None or self.snapshot.version != version:
+            self.snapshot = await self._build(db, version)
+            permission_cache.clear()
+        self._checked_at = now
+        return self.snapshot
+
+    async def _build(self, db: AsyncSession, version: int) -> RBACSnapshot:
+        stmt = (
+            select(Permission.id, Permission.name, permission_role.c.role_id)
+            .select_from(Permission)
+            .outerjoin(permission_role, permission_role.c.permission_id == Permission.id)
+        )
+        result = await db.execute(stmt)
+
+        permission_ids: Dict[str, int] = {}
+        role_permissions: Dict[int, List[int]] = {}
+        for perm_id, perm_name, role_id in result.all():
+            permission_ids[perm_name] = perm_id
+            if role_id is not None:
+                role_permissions.setdefault(role_id, []).append(perm_id)
+        return RBACSnapshot(version, permission_ids, role_permissions)
+
+    def is_fresh(self) -> bool:
+        """True while the last version check is within the poll interval."""
+        return time.monotonic() - self._checked_at < self.poll_interval
+
+    def invalidate(self) -> None:
+        """Forces a version check on the next access (used right after a local write)."""
+        self._checked_at = 0.0
+
+    def reset(self) -> None:
+        self.snapshot = None
+        self._checked_at = 0.0
+
+
+# Singleton instance
+rbac_graph = RBACGraph(poll_interval=settings.RBAC_VERSION_POLL_INTERVAL)
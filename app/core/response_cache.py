@@ -0,0 +1,190 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from starlette.requests import HTTPConnection
+
+from app.core.database import READ_FROM_PRIMARY_STATE, SessionLocal, is_sticky_to_primary
+from app.core.rbac_graph import rbac_graph
+
+# Headers replayed from a cached response (cookies and per-request stats are not)
+_CACHED_HEADERS = {b"content-type", b"x-next-cursor", b"x-total-count", b"x-total-count-approximate"}
+
+
+class CachedResponse(NamedTuple):
+    version: int
+    etag: str
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag: hash of the exact bytes sent."""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate == etag or candidate == "W/" + etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    In-process LRU of rendered GET responses, keyed by path + query string.
+    Entries are tagged with the RBAC version they were rendered under: a newer
+    version (a write in any worker) turns them into misses, and RBACService
+    clears the whole cache after its own writes.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        # Bumped on clear() so a response rendered before a write is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        entry = self._data.get(key)
+        if entry is None or entry.version != version:
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse, generation: Optional[int] = None) -> None:
+        if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Singleton instance
+response_cache = ResponseCache(maxsize=settings.RESPONSE_CACHE_SIZE)
+
+
+async def _current_rbac_version() -> int:
+    # Within the poll interval the known version is trusted, no DB round trip
+    if rbac_graph.snapshot is not None and rbac_graph.is_fresh():
+        return rbac_graph.snapshot.version
+    async with SessionLocal() as db:
+        snapshot = await rbac_graph.get_snapshot(db)
+    return snapshot.version
+
+
+class ResponseCacheMiddleware:
+    """
+    Pure ASGI middleware adding strong ETags and a response cache to GET
+    requests whose path matches one of `paths` (regexes).
+    `If-None-Match` on a cached, still current response gets a 304 without
+    running the endpoint.
+    Responses are rendered from the primary, the source of the RBAC version they
+    are tagged with: a lagging replica could otherwise store a pre-write page
+    under the new version. Clients holding the read-your-writes cookie bypass
+    the cache altogether.
+    """
+
+    def __init__(self, app, paths: Sequence[str], cache: ResponseCache = response_cache):
+        self.app = app
+        self.paths = [re.compile(pattern) for pattern in paths]
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not any(pattern.fullmatch(scope["path"]) for pattern in self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+        if is_sticky_to_primary(HTTPConnection(scope).cookies):
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        if_none_match = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+
+        version = await _current_rbac_version()
+        entry = self.cache.get(key, version)
+        if entry is not None:
+            self.cache.hits += 1
+            await self._send_cached(send, entry, if_none_match)
+            return
+
+        self.cache.misses += 1
+        generation = self.cache.generation
+        start = None
+        chunks = []
+
+        async def buffer(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await finish()
+            else:
+                await send(message)
+
+        async def finish():
+            body = b"".join(chunks)
+            if start["status"] != 200:
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+            entry = CachedResponse(
+                version=version,
+                etag=make_etag(body),
+                headers=[(name, value) for name, value in start.get("headers", []) if name in _CACHED_HEADERS],
+                body=body,
+            )
+            self.cache.set(key, entry, generation=generation)
+            passthrough = [
+                (name, value) for name, value in start.get("headers", [])
+                if name not in _CACHED_HEADERS and name != b"content-length"
+            ]
+            await self._send_cached(send, entry, if_none_match, extra_headers=passthrough)
+
+        # Read by get_read_db through request.state
+        scope.setdefault("state", {})[READ_FROM_PRIMARY_STATE] = True
+        await self.app(scope, receive, buffer)
+
+    async def _send_cached(self, send, entry: CachedResponse, if_none_match, extra_headers=()) -> None:
+        headers = [(b"etag", entry.etag.encode()), (b"cache-control", b"no-cache")]
+        if etag_matches(if_none_match, entry.etag):
+            self.cache.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers + list(extra_headers)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += entry.headers + list(extra_headers)
+        headers.append((b"content-length", str(len(entry.body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
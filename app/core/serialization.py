@@ -0,0 +1,29 @@
+import json
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, see requirements.txt
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes of plain dicts / lists / scalars: orjson when installed, the stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """
+    Response for already shaped data (dicts from narrow SELECTs): encoded in one
+    pass, without FastAPI's response_model validation / serialization. Returning
+    it from an endpoint skips `response_model`, so the data must match it.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,174 @@
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+sql_logger = logging.getLogger("fastapi_app.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Shape of a statement, so repeats can be counted: literals become ?,
+    IN lists / multi-row VALUES collapse to a single (?).
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERALS.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _VALUES_ROWS.sub(r"\1", statement)
+
+
+class RequestSQLStats:
+    """Statements executed while serving one HTTP request."""
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.slowest: List[Tuple[float, str]] = []
+        # Statements already executed when the response headers went out
+        self.headers_count: Optional[int] = None
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[normalize_statement(statement)] += 1
+
+        keep = settings.SQL_SLOWEST_KEPT
+        if len(self.slowest) < keep or duration > self.slowest[-1][0]:
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[keep:]
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times (likely N+1)."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "statements": self.count,
+            "statements_after_headers": self.count - self.headers_count if self.headers_count is not None else 0,
+            "db_time_ms": round(self.total_time * 1000, 3),
+            "slowest": [
+                {"ms": round(duration * 1000, 3), "statement": statement}
+                for duration, statement in self.slowest
+            ],
+            "n_plus_one": [
+                {"statement": shape, "count": count}
+                for shape, count in self.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD)
+            ],
+        }
+
+
+_current_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("sql_request_stats", default=None)
+
+# Summaries of the latest requests, served by GET /api/v1/debug/sql
+recent_requests: deque = deque(maxlen=settings.SQL_STATS_HISTORY)
+
+
+def current_stats() -> Optional[RequestSQLStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        sql_logger.warning(
+            "Slow query (%.1f ms) %s",
+            duration * 1000,
+            _WHITESPACE.sub(" ", statement),
+            extra={"duration_ms": round(duration * 1000, 3), "path": stats.path if stats else None},
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attaches the timing hooks to an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Pure ASGI middleware collecting per-request SQL stats: statement count and DB
+    time are returned as X-DB-Query-Count / X-DB-Time-Ms headers, repeated statement
+    shapes (N+1) are logged, and each summary is kept in `recent_requests`.
+    Headers only cover the statements run before the response starts: a streamed
+    body (exports...) queries afterwards, so its full totals are logged when the
+    response finishes and kept in `recent_requests`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats(scope.get("method", ""), scope.get("path", ""))
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                stats.headers_count = stats.count
+            if message["type"] == "http.response.start" and settings.SQL_STATS_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.total_time * 1000:.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            self._finish(stats)
+
+    def _finish(self, stats: RequestSQLStats) -> None:
+        if not stats.count:
+            return
+        if stats.headers_count is not None and stats.count > stats.headers_count:
+            sql_logger.info(
+                "Streamed response %s %s: %d statements (%d after the headers), %.3f ms DB time",
+                stats.method, stats.path, stats.count, stats.count - stats.headers_count, stats.total_time * 1000,
+                extra={"path": stats.path, "statements": stats.count, "duration_ms": round(stats.total_time * 1000, 3)},
+            )
+        for shape, count in stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            sql_logger.warning(
+                "Possible N+1 on %s %s: statement executed %d times: %s",
+                stats.method, stats.path, count, shape,
+                extra={"path": stats.path, "repeat_count": count},
+            )
+        recent_requests.append(stats.to_dict())
@@ -1,37 +1,73 @@
-import sys
 import os
-
-# Add project root to sys.path to allow running script directly
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from app.core.config import settings
+from app.core.count_cache import count_cache
 from app.core.logging_config import logger
+from app.core.database import dispose_engines, replica_router, warm_up_pool
+from app.core.hashing import password_hasher
+from app.core.permission_cache import permission_cache
+from app.core.rbac_graph import rbac_graph
+from app.core.response_cache import response_cache
+
+
+async def init_worker() -> None:
+    """
+    Per-process state, set up in each worker's startup: connections, caches and
+    the hash pool inherited from a pre-fork parent (gunicorn --preload, ...) are
+    dropped so no two workers share them.
+    """
+    await dispose_engines(close=False)
+    replica_router.reset()
+    rbac_graph.reset()
+    permission_cache.clear()
+    response_cache.clear()
+    count_cache.clear()
+    password_hasher.reset()
 
-from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("🚀 Application is starting up...")
+    logger.info(f"🚀 Application is starting up (pid {os.getpid()})...")
+    await init_worker()
+    opened = await warm_up_pool()
+    logger.info(f"Database pool warmed up with {opened} connection(s)")
     yield
-    logger.info("🛑 Application is shutting down...")
+    logger.info(f"🛑 Application is shutting down (pid {os.getpid()})...")
+    await dispose_engines()
+    password_hasher.shutdown()
+
+
+def create_app() -> FastAPI:
+    """
+    Application factory, the only way the app is built: `uvicorn --factory app.main:create_app`
+    (development, `python -m app.server` in production) or `create_app()` for in-process clients.
+    Each call returns a fresh app whose lifespan sets up that process's state (init_worker).
+    """
+    application = FastAPI(
+        title=settings.PROJECT_NAME,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan
+    )
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    lifespan=lifespan
-)
+    if settings.RESPONSE_CACHE_ENABLED:
+        from app.core.response_cache import ResponseCacheMiddleware
+        application.add_middleware(ResponseCacheMiddleware, paths=[rf"{settings.API_V1_STR}/roles/(\d+)?"])
 
+    if settings.SQL_INSTRUMENTATION:
+        from app.core.sql_instrumentation import SQLInstrumentationMiddleware
+        application.add_middleware(SQLInstrumentationMiddleware)
 
-from app.api.v1.api import api_router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+    if settings.DATABASE_REPLICA_URLS:
+        from app.core.database import ReadYourWritesMiddleware
+        application.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_WINDOW)
 
-if __name__ == "__main__":
-    import uvicorn
-    # Use the string import "app.main:app" for reload to work
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
+    from app.api.v1.api import api_router
+    application.include_router(api_router, prefix=settings.API_V1_STR)
 
+    @application.get("/")
+    async def root():
+        return {"message": "Welcome to FastAPI Base System"}
 
-@app.get("/")
-async def root():
-    return {"message": "Welcome to FastAPI Base System"}
+    return application
@@ -1,3 +1,4 @@
 from app.models.user import User
-from app.models.rbac import Role, Permission
+from app.models.rbac import Role, Permission, RBACVersion
 from app.models.product import Product
+from app.models.seeder import SeederRun
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.database import Base
 
 class Product(Base):
@@ -6,5 +6,10 @@ class Product(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True, nullable=False)
-    price = Column(Float, nullable=False)
+    price = Column(Float, index=True, nullable=False)
     description = Column(String(500), nullable=True)
+
+    __table_args__ = (
+        # Relevance search (MATCH ... AGAINST); other databases fall back to LIKE
+        Index("ft_products_name_description", "name", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
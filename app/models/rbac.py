@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -18,6 +18,16 @@ permission_role = Table(
     Column("role_id", Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
 )
 
+# Denormalized User <-> Permission pairs (role_user x permission_role), maintained by RBACService
+user_effective_permissions = Table(
+    "user_effective_permissions",
+    Base.metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("permission_id", Integer, ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
+    # "Who holds permission P" is an index range scan
+    Index("ix_user_effective_permissions_permission_id_user_id", "permission_id", "user_id"),
+)
+
 class Role(Base):
     __tablename__ = "roles"
 
@@ -26,9 +36,15 @@ class Role(Base):
     guard_name = Column(String(50), default="web")
     description = Column(String(255), nullable=True)
 
-    # Relationships
-    permissions = relationship("Permission", secondary=permission_role, back_populates="roles", lazy="selectin")
-    users = relationship("User", secondary=role_user, back_populates="roles", lazy="selectin")
+    # Relationships (ordered by id, like the FAST_JSON_RESPONSES row path)
+    permissions = relationship(
+        "Permission", secondary=permission_role, back_populates="roles", lazy="selectin", order_by="Permission.id"
+    )
+    # Never loaded through the ORM (can be huge): see RBACService.get_role_members / get_member_counts
+    users = relationship("User", secondary=role_user, back_populates="roles", lazy="raise", passive_deletes=True)
+
+    # Not a column: filled in by RBACService.attach_member_counts
+    member_count = None
 
 class Permission(Base):
     __tablename__ = "permissions"
@@ -40,3 +56,13 @@ class Permission(Base):
 
     # Relationships
     roles = relationship("Role", secondary=permission_role, back_populates="permissions")
+
+class RBACVersion(Base):
+    """
+    Single-row counter bumped by every RBAC write.
+    Workers compare it with their compiled snapshot to detect staleness.
+    """
+    __tablename__ = "rbac_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+from app.core.database import Base
+
+class SeederRun(Base):
+    """
+    Ledger of applied seeders (see database/seeding.py): a seeder whose source
+    checksum is unchanged since its last successful run is skipped.
+    """
+    __tablename__ = "seeder_runs"
+
+    name = Column(String(100), primary_key=True)
+    checksum = Column(String(64), nullable=False)
+    ran_at = Column(DateTime, nullable=False)
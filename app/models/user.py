@@ -14,4 +14,4 @@ class User(Base):
     # RBAC Relationship
     from app.models.rbac import role_user # Late import to avoid circular dependency
     from sqlalchemy.orm import relationship
-    roles = relationship("Role", secondary="role_user", back_populates="users", lazy="selectin")
+    roles = relationship("Role", secondary="role_user", back_populates="users", lazy="selectin", order_by="Role.id")
@@ -0,0 +1,48 @@
+from enum import Enum
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+# Shared properties
+class ProductBase(BaseModel):
+    name: str
+    price: float
+    description: Optional[str] = None
+
+class ProductResponse(ProductBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+# Search hit: relevance first (higher is better), then id
+class ProductSearchResult(ProductResponse):
+    score: float
+
+# Bulk import (POST /products/import, `migrate.py import-products`)
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+class ProductImportRow(BaseModel):
+    id: Optional[int] = None # Upsert key; rows without one are inserted
+    name: str = Field(min_length=1, max_length=255)
+    price: float = Field(ge=0)
+    description: Optional[str] = Field(None, max_length=500)
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def empty_is_none(cls, value):
+        # Empty CSV cells
+        return None if value == "" else value
+
+class ProductImportError(BaseModel):
+    row: int # 1-based data row (CSV header and blank lines not counted)
+    detail: str
+
+class ProductImportReport(BaseModel):
+    rows: int # Data rows read
+    imported: int # Rows inserted or updated
+    failed: int
+    errors: List[ProductImportError] = [] # First PRODUCT_IMPORT_MAX_ERRORS failures
+    seconds: float
+    rows_per_second: float
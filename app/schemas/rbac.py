@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Collection, List, Optional
+from app.core.fieldsets import pick
 
 # Permission Schemas
 class PermissionBase(BaseModel):
@@ -32,3 +33,28 @@ class RoleResponse(RoleBase):
 
     class Config:
         from_attributes = True
+
+class RoleDetailResponse(RoleResponse):
+    member_count: Optional[int] = None # Computed with a grouped COUNT, members themselves are never loaded
+
+# Batch role assignment / revocation (every user id x every role id)
+class RoleAssignmentBatch(BaseModel):
+    user_ids: List[int]
+    role_ids: List[int]
+
+class RoleAssignmentBatchResponse(BaseModel):
+    requested: int # Distinct user x role pairs asked for
+    affected: int # role_user rows actually inserted / deleted
+
+# Sparse fieldsets (`fields=` / `include=` on list endpoints)
+PERMISSION_FIELDS = tuple(PermissionResponse.model_fields)
+ROLE_FIELDS = tuple(name for name in RoleResponse.model_fields if name != "permissions")
+ROLE_INCLUDES = ("permissions", "member_count")
+
+def role_to_dict(role, fields=ROLE_FIELDS, include: Collection[str] = ()) -> dict:
+    data = pick(role, fields)
+    if "permissions" in include:
+        data["permissions"] = [pick(perm, PERMISSION_FIELDS) for perm in role.permissions]
+    if "member_count" in include:
+        data["member_count"] = role.member_count
+    return data
@@ -1,12 +1,13 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 
 # Shared properties
+# Lengths match the users columns: MySQL INSERT IGNORE (bulk creation) would silently truncate longer values
 class UserBase(BaseModel):
-    email: EmailStr
+    email: EmailStr = Field(max_length=255)
     is_active: bool = True
     is_superuser: bool = False
-    full_name: Optional[str] = None
+    full_name: Optional[str] = Field(None, max_length=255)
 
 # Properties to receive via API on creation
 class UserCreate(UserBase):
@@ -17,7 +18,7 @@ class UserUpdate(UserBase):
     password: Optional[str] = None
 
 # Properties to return via API
-from app.schemas.rbac import RoleResponse # Import Role Schema
+from app.schemas.rbac import RoleResponse, role_to_dict # Import Role Schema
 
 class UserResponse(UserBase):
     id: int
@@ -25,3 +26,39 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+# User without its roles (role member listings)
+class UserSummaryResponse(UserBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+# Sparse fieldsets (`fields=` / `include=` on list endpoints)
+from app.core.fieldsets import FieldSelection, pick
+
+USER_FIELDS = tuple(name for name in UserResponse.model_fields if name != "roles")
+USER_INCLUDES = ("roles", "roles.permissions")
+
+def user_to_dict(user, selection: FieldSelection) -> dict:
+    data = pick(user, selection.fields)
+    if "roles" in selection.include:
+        role_include = ("permissions",) if "roles.permissions" in selection.include else ()
+        data["roles"] = [role_to_dict(role, include=role_include) for role in user.roles]
+    return data
+
+# Bulk creation
+class UserBulkCreate(BaseModel):
+    users: List[UserCreate]
+
+class UserBulkResult(BaseModel):
+    index: int # Position of the row in the request
+    email: str
+    id: Optional[int] = None
+    status: str # "created", "duplicate" or "error"
+    detail: Optional[str] = None
+
+class UserBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[UserBulkResult]
@@ -0,0 +1,64 @@
+"""
+Production launcher: `python -m app.server [--workers N] [--port 8000]`.
+
+Starts SERVER_WORKERS uvicorn worker processes (one per CPU by default) on a
+shared socket, each building its own app through `app.main:create_app`, with
+uvloop / httptools when installed. SIGTERM / SIGINT stop accepting connections
+and let in-flight requests finish for up to SERVER_GRACEFUL_TIMEOUT seconds.
+For development use `uvicorn --factory app.main:create_app --reload`.
+"""
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="0 = one per CPU")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    # Each worker owns a password hashing pool: share the cores instead of starting workers x CPUs processes
+    if not settings.PASSWORD_HASH_WORKERS:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    connections = workers * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    print(
+        f"Starting {workers} worker(s) on {args.host}:{args.port} ({loop}, {http}); "
+        f"up to {connections} database connection(s) in total"
+    )
+
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, case, insert, literal, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import upsert
+from app.core.ingest import ParsedRecord, iter_records
+from app.models.product import Product
+from app.schemas.product import (
+    ImportFormat, ProductImportError, ProductImportReport, ProductImportRow,
+)
+
+# Terms of a LIKE fallback search; longer queries keep their first terms
+MAX_LIKE_TERMS = 8
+
+
+class ProductService:
+    def _score(self, db: AsyncSession, q: str):
+        """
+        (relevance expression, match condition) for `q`. MySQL ranks with the
+        FULLTEXT index (natural language mode); other databases count LIKE hits,
+        a name hit weighing twice a description hit.
+        """
+        if db.bind.dialect.name == "mysql":
+            from sqlalchemy.dialects.mysql import match
+            score = match(Product.name, Product.description, against=q)
+            return score, score
+
+        terms = q.split()[:MAX_LIKE_TERMS]
+        hits = []
+        for term in terms:
+            pattern = f"%{term}%"
+            hits.append(case(
+                (Product.name.ilike(pattern), 2.0),
+                (Product.description.ilike(pattern), 1.0),
+                else_=0.0,
+            ))
+        score = sum(hits[1:], hits[0]) if hits else literal(0.0)
+        return score, score > 0
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List:
+        """
+        Products matching `q`, best match first (ties by id), as rows of
+        (id, name, price, description, score) from one narrow SELECT.
+        `after` = (score, id) of the last row of the previous page (keyset pagination).
+        The price range is applied through the `price` index.
+        """
+        score, matches = self._score(db, q)
+        score = score.label("score")
+        stmt = select(Product.id, Product.name, Product.price, Product.description, score).where(matches)
+        if min_price is not None:
+            stmt = stmt.where(Product.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(Product.price <= max_price)
+        if after is not None:
+            last_score, last_id = after
+            stmt = stmt.where(or_(
+                score.element < last_score,
+                and_(score.element == last_score, Product.id > last_id),
+            ))
+        stmt = stmt.order_by(score.desc(), Product.id).limit(limit)
+        result = await db.execute(stmt)
+        return result.all()
+
+    async def import_products(
+        self,
+        db: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        format: ImportFormat,
+        batch_size: Optional[int] = None,
+    ) -> ProductImportReport:
+        """
+        Streams a CSV / NDJSON product feed into `products`: records are parsed as
+        the bytes arrive, validated `batch_size` at a time and written with
+        multi-row upserts on `id` (rows without an id are inserted), one commit per
+        batch. Invalid rows are skipped and reported, as are all rows of a batch
+        the database rejects; memory holds one batch.
+        """
+        batch_size = batch_size or settings.PRODUCT_IMPORT_BATCH_SIZE
+        started = time.perf_counter()
+        rows = imported = failed = 0
+        errors: List[ProductImportError] = []
+
+        def fail(row: int, detail: str) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+                errors.append(ProductImportError(row=row, detail=detail))
+
+        batch: List[ParsedRecord] = []
+
+        async def flush() -> None:
+            nonlocal imported
+            valid = self._validate_batch(batch, fail)
+            batch.clear()
+            if not valid:
+                return
+            try:
+                written = await self._write_batch(db, [data for _, data in valid])
+                await db.commit()
+            except SQLAlchemyError as e:
+                await db.rollback()
+                detail = f"Batch not written: {getattr(e, 'orig', None) or e}"
+                for row, _ in valid:
+                    fail(row, detail)
+                return
+            imported += written
+
+        records = iter_records(
+            chunks, csv_format=format == ImportFormat.csv, max_record_size=settings.PRODUCT_IMPORT_MAX_RECORD_SIZE
+        )
+        async for record in records:
+            rows += 1
+            if record.error is not None:
+                fail(record.row, record.error)
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await flush()
+        await flush()
+
+        seconds = time.perf_counter() - started
+        return ProductImportReport(
+            rows=rows,
+            imported=imported,
+            failed=failed,
+            errors=sorted(errors, key=lambda error: error.row),
+            seconds=round(seconds, 3),
+            rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+        )
+
+    def _validate_batch(self, batch: List[ParsedRecord], fail) -> List[Tuple[int, dict]]:
+        """
+        (row, data) of the valid records, the whole batch validated in one call;
+        when some rows are invalid they are reported and the others validated
+        again without them.
+        """
+        if not batch:
+            return []
+        try:
+            valid = _import_rows.validate_python([r.data for r in batch])
+            return [(record.row, row.model_dump()) for record, row in zip(batch, valid)]
+        except ValidationError as e:
+            invalid = {}
+            for error in e.errors(include_url=False):
+                index, *field = error["loc"]
+                message = f"{'.'.join(map(str, field))}: {error['msg']}" if field else error["msg"]
+                invalid.setdefault(index, []).append(message)
+        for index, messages in sorted(invalid.items()):
+            fail(batch[index].row, "; ".join(messages))
+        remaining = [record for index, record in enumerate(batch) if index not in invalid]
+        return self._validate_batch(remaining, fail)
+
+    async def _write_batch(self, db: AsyncSession, rows: List[dict]) -> int:
+        """Upserts / inserts one batch; returns the products written."""
+        # Last occurrence wins when an id repeats within the batch
+        keyed = {row["id"]: row for row in rows if row["id"] is not None}
+        new = [{k: v for k, v in row.items() if k != "id"} for row in rows if row["id"] is None]
+        if keyed:
+            await upsert(
+                db, Product.__table__, keyed.values(), key=["id"], update=["name", "price", "description"],
+                chunk_size=len(keyed),
+            )
+        if new:
+            await db.execute(insert(Product.__table__), new)
+        return len(keyed) + len(new)
+
+
+_import_rows = TypeAdapter(List[ProductImportRow])
+
+product_service = ProductService()
@@ -1,7 +1,18 @@
+from typing import Dict, Iterable, List, Optional, Union
+from sqlalchemy import and_, delete, exists, func, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from app.models.rbac import Role, Permission
+from sqlalchemy.orm import load_only, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.core.count_cache import CountEntry, count_cache, count_table
+from app.core.permission_cache import permission_cache, EffectivePermissions
+from app.core.principal import Principal
+from app.core.rbac_graph import rbac_graph, RBACSnapshot, RBAC_VERSION_ROW_ID
+from app.core.response_cache import response_cache
+from app.core.database import insert_ignore
+from app.core.fieldsets import FieldSelection
+from app.models.rbac import Role, Permission, RBACVersion, role_user, permission_role, user_effective_permissions
 from app.models.user import User
 from app.schemas.rbac import RoleCreate, PermissionCreate, RoleUpdate
 
@@ -17,17 +28,24 @@ class RBACService:
             # Fetch permissions by name
             result = await db.execute(select(Permission).filter(Permission.name.in_(role_in.permissions)))
             permissions = result.scalars().all()
-            db_role.permissions = list(permissions)
+            db_role.permissions = sorted(permissions, key=lambda perm: perm.id)
             
         db.add(db_role)
+        await self._bump_version(db)
         await db.commit()
+        count_cache.adjust("roles", 1)
+        # A brand new role has no members yet, so no cached user is affected
+        self._invalidate()
         await db.refresh(db_role)
+        db_role.member_count = 0
         return db_role
 
     async def create_permission(self, db: AsyncSession, perm_in: PermissionCreate):
         db_perm = Permission(name=perm_in.name, description=perm_in.description)
         db.add(db_perm)
+        await self._bump_version(db)
         await db.commit()
+        self._invalidate()
         await db.refresh(db_perm)
         return db_perm
 
@@ -45,18 +63,108 @@ class RBACService:
 
         if role not in user.roles:
             user.roles.append(role)
+            await db.flush()
+            await self._grant_effective_permissions(db, role.id, user_ids=[user_id])
+            await self._bump_version(db)
             await db.commit()
+            count_cache.adjust(f"role_users:{role.id}", 1)
+            self._invalidate(user_id=user_id)
             await db.refresh(user)
         return user
 
-    async def get_roles(self, db: AsyncSession, skip: int = 0, limit: int = 100):
-        result = await db.execute(select(Role).offset(skip).limit(limit))
+    async def get_roles(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        selection: Optional[FieldSelection] = None,
+    ):
+        # Role.users is never serialized in a role listing
+        options = [noload(Role.users)]
+        if selection is not None:
+            options.append(load_only(*(getattr(Role, name) for name in selection.fields)))
+            if "permissions" not in selection.include:
+                options.append(noload(Role.permissions))
+
+        stmt = select(Role).options(*options).order_by(Role.id)
+        if after_id is not None:
+            # Keyset pagination: seek on the primary key instead of scanning skipped rows
+            stmt = stmt.where(Role.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        result = await db.execute(stmt.limit(limit))
         return result.scalars().all()
 
+    async def get_role_rows(
+        self, db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        get_roles + attach_member_counts as plain dicts shaped like RoleDetailResponse
+        (for FastJSONResponse): narrow column SELECTs, no ORM objects.
+        """
+        stmt = select(Role.name, Role.description, Role.id).order_by(Role.id)
+        if after_id is not None:
+            stmt = stmt.where(Role.id > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        result = await db.execute(stmt.limit(limit))
+        roles = [
+            {"name": name, "description": description, "id": role_id, "permissions": []}
+            for name, description, role_id in result.all()
+        ]
+        await self._attach_permission_rows(db, roles)
+        counts = await self.get_member_counts(db, (role["id"] for role in roles))
+        for role in roles:
+            role["member_count"] = counts[role["id"]]
+        return roles
+
+    async def get_user_role_rows(self, db: AsyncSession, user_ids: List[int]) -> Dict[int, List[dict]]:
+        """
+        Roles of each user, with their permissions, as dicts shaped like RoleResponse.
+        A role held by many users is built once and shared.
+        """
+        by_user: Dict[int, List[dict]] = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return by_user
+        result = await db.execute(
+            select(role_user.c.user_id, Role.name, Role.description, Role.id)
+            .join(Role, Role.id == role_user.c.role_id)
+            .where(role_user.c.user_id.in_(user_ids))
+            .order_by(role_user.c.user_id, Role.id)
+        )
+        roles: Dict[int, dict] = {}
+        for user_id, name, description, role_id in result.all():
+            role = roles.get(role_id)
+            if role is None:
+                role = roles[role_id] = {"name": name, "description": description, "id": role_id, "permissions": []}
+            by_user[user_id].append(role)
+        await self._attach_permission_rows(db, list(roles.values()))
+        return by_user
+
+    async def _attach_permission_rows(self, db: AsyncSession, roles: List[dict]) -> None:
+        """Fills the `permissions` list of role dicts, one query for all of them."""
+        by_id = {role["id"]: role for role in roles}
+        if not by_id:
+            return
+        result = await db.execute(
+            select(permission_role.c.role_id, Permission.name, Permission.description, Permission.id)
+            .join(Permission, Permission.id == permission_role.c.permission_id)
+            .where(permission_role.c.role_id.in_(list(by_id)))
+            .order_by(permission_role.c.role_id, Permission.id)
+        )
+        for role_id, name, description, permission_id in result.all():
+            by_id[role_id]["permissions"].append({"name": name, "description": description, "id": permission_id})
+
     async def get_role_by_id(self, db: AsyncSession, role_id: int):
         result = await db.execute(select(Role).filter(Role.id == role_id))
         return result.scalars().first()
 
+    async def role_exists(self, db: AsyncSession, role_id: int) -> bool:
+        """Primary-key probe, nothing loaded."""
+        result = await db.execute(select(exists().where(Role.id == role_id)))
+        return bool(result.scalar())
+
     async def update_role(self, db: AsyncSession, role_id: int, role_in: RoleUpdate):
         role = await self.get_role_by_id(db, role_id)
         if not role:
@@ -67,24 +175,53 @@ class RBACService:
             role.description = role_in.description
         
         if role_in.permissions is not None:
-            # Update permissions
-            # Clear existing
-            role.permissions.clear()
+            current_ids = {perm.id for perm in role.permissions}
+            permissions = []
             if role_in.permissions:
-                 result = await db.execute(select(Permission).filter(Permission.name.in_(role_in.permissions)))
-                 permissions = result.scalars().all()
-                 role.permissions = list(permissions)
+                result = await db.execute(select(Permission).filter(Permission.name.in_(role_in.permissions)))
+                permissions = sorted(result.scalars().all(), key=lambda perm: perm.id)
+            requested_ids = {perm.id for perm in permissions}
+
+            # Only the difference hits permission_role, unchanged rows are left alone
+            added = requested_ids - current_ids
+            removed = current_ids - requested_ids
+            if removed:
+                await db.execute(
+                    delete(permission_role).where(
+                        permission_role.c.role_id == role_id,
+                        permission_role.c.permission_id.in_(removed),
+                    )
+                )
+                await self._revoke_effective_permissions(db, role_id, permission_ids=removed)
+            if added:
+                # A concurrent update may have added the same pairs since current_ids was read
+                await db.execute(
+                    insert_ignore(permission_role),
+                    [{"role_id": role_id, "permission_id": perm_id} for perm_id in sorted(added)],
+                )
+                await self._grant_effective_permissions(db, role_id, permission_ids=added)
+            # The collection now matches the table: mark it loaded, no refresh needed
+            set_committed_value(role, "permissions", permissions)
 
+        await self._bump_version(db)
         await db.commit()
-        await db.refresh(role)
+        self._invalidate(role_id=role_id)
         return role
 
     async def delete_role(self, db: AsyncSession, role_id: int):
         role = await self.get_role_by_id(db, role_id)
         if not role:
             return False
+        # Must run while the role's role_user / permission_role rows still exist
+        await self._revoke_effective_permissions(db, role_id, exclude_role=True)
+        # Memberships go in one statement instead of loading Role.users
+        await db.execute(delete(role_user).where(role_user.c.role_id == role_id))
         await db.delete(role)
+        await self._bump_version(db)
         await db.commit()
+        count_cache.adjust("roles", -1)
+        count_cache.invalidate(f"role_users:{role_id}")
+        self._invalidate(role_id=role_id)
         return True
 
     async def remove_role_from_user(self, db: AsyncSession, user_id: int, role_id: int):
@@ -101,9 +238,357 @@ class RBACService:
         
         if role_to_remove:
             user.roles.remove(role_to_remove)
+            await db.flush()
+            await self._revoke_effective_permissions(db, role_id, user_ids=[user_id])
+            await self._bump_version(db)
             await db.commit()
+            count_cache.adjust(f"role_users:{role_id}", -1)
+            self._invalidate(user_id=user_id)
             await db.refresh(user)
         
         return user
 
+    async def assign_roles_bulk(
+        self, db: AsyncSession, user_ids: Iterable[int], role_ids: Iterable[int], chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Grants every role in `role_ids` to every user in `user_ids` with one
+        INSERT IGNORE ... SELECT per chunk of users; ids that do not exist are
+        dropped by the join, existing pairs by the primary key. Nothing is loaded
+        into the session. Returns the number of role_user rows inserted.
+        """
+        user_ids, role_ids = sorted(set(user_ids)), sorted(set(role_ids))
+        chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        affected = 0
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            pairs = (
+                select(User.id, Role.id)
+                .select_from(User)
+                .join(Role, true())
+                .where(User.id.in_(chunk), Role.id.in_(role_ids))
+            )
+            result = await db.execute(insert_ignore(role_user).from_select(["user_id", "role_id"], pairs))
+            affected += result.rowcount
+            await self._grant_effective_permissions(db, role_ids, user_ids=chunk)
+
+        if affected:
+            await self._bump_version(db)
+        await db.commit()
+        if affected:
+            for role_id in role_ids:
+                count_cache.invalidate(f"role_users:{role_id}")
+            self._invalidate(user_ids=user_ids)
+        return affected
+
+    async def revoke_roles_bulk(
+        self, db: AsyncSession, user_ids: Iterable[int], role_ids: Iterable[int], chunk_size: Optional[int] = None
+    ) -> int:
+        """
+        Removes every role in `role_ids` from every user in `user_ids` with one
+        DELETE per chunk of users. Returns the number of role_user rows deleted.
+        """
+        user_ids, role_ids = sorted(set(user_ids)), sorted(set(role_ids))
+        chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        affected = 0
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            result = await db.execute(
+                delete(role_user).where(role_user.c.user_id.in_(chunk), role_user.c.role_id.in_(role_ids))
+            )
+            affected += result.rowcount
+            await self._revoke_effective_permissions(db, role_ids, user_ids=chunk)
+
+        if affected:
+            await self._bump_version(db)
+        await db.commit()
+        if affected:
+            for role_id in role_ids:
+                count_cache.invalidate(f"role_users:{role_id}")
+            self._invalidate(user_ids=user_ids)
+        return affected
+
+    async def sync_after_bulk_write(self, db: AsyncSession, role_ids: Iterable[int]):
+        """
+        For role / permission rows written in bulk outside this service (seeders):
+        grants the user_effective_permissions they imply and bumps the RBAC version.
+        The caller commits.
+        """
+        role_ids = list(role_ids)
+        if role_ids:
+            await self._grant_effective_permissions(db, role_ids)
+        await self._bump_version(db)
+
+    async def count_roles(self, db: AsyncSession) -> CountEntry:
+        """Total of the get_roles listing, from the count cache."""
+        return await count_cache.get("roles", lambda: count_table(db, Role.__table__))
+
+    async def count_role_members(self, db: AsyncSession, role_id: int) -> CountEntry:
+        """Total of the get_role_members listing, from the count cache."""
+        async def count():
+            return (await self.get_member_counts(db, [role_id]))[role_id], False
+        return await count_cache.get(f"role_users:{role_id}", count)
+
+    async def get_member_counts(self, db: AsyncSession, role_ids: Iterable[int]) -> Dict[int, int]:
+        """Number of users per role, one grouped COUNT for the whole page of roles."""
+        role_ids = list(role_ids)
+        if not role_ids:
+            return {}
+        result = await db.execute(
+            select(role_user.c.role_id, func.count())
+            .where(role_user.c.role_id.in_(role_ids))
+            .group_by(role_user.c.role_id)
+        )
+        counts = dict(result.all())
+        return {role_id: counts.get(role_id, 0) for role_id in role_ids}
+
+    async def attach_member_counts(self, db: AsyncSession, roles: List[Role]) -> List[Role]:
+        """Sets `member_count` on each role (read by RoleDetailResponse)."""
+        counts = await self.get_member_counts(db, (role.id for role in roles))
+        for role in roles:
+            role.member_count = counts[role.id]
+        return roles
+
+    async def get_role_members(
+        self, db: AsyncSession, role_id: int, limit: int = 100, after_id: Optional[int] = None
+    ):
+        """
+        Users holding a role, ordered by id, keyset-paginated on role_user (role_id, user_id).
+        The users' own roles are not loaded.
+        """
+        stmt = (
+            select(User)
+            .join(role_user, role_user.c.user_id == User.id)
+            .where(role_user.c.role_id == role_id)
+            .options(noload(User.roles))
+            .order_by(role_user.c.user_id)
+        )
+        if after_id is not None:
+            stmt = stmt.where(role_user.c.user_id > after_id)
+        result = await db.execute(stmt.limit(limit))
+        return result.scalars().all()
+
+    async def _grant_effective_permissions(
+        self,
+        db: AsyncSession,
+        role_id: Union[int, Iterable[int]],
+        user_ids: Optional[Iterable[int]] = None,
+        permission_ids: Optional[Iterable[int]] = None,
+    ):
+        """
+        Adds (member, permission) pairs granted by `role_id` (one id or several) to
+        user_effective_permissions, optionally narrowed to some members / permissions.
+        Pending ORM changes must be flushed.
+        """
+        role_ids = [role_id] if isinstance(role_id, int) else list(role_id)
+        stmt = (
+            select(role_user.c.user_id, permission_role.c.permission_id)
+            .select_from(role_user)
+            .join(permission_role, permission_role.c.role_id == role_user.c.role_id)
+            .where(role_user.c.role_id.in_(role_ids))
+        )
+        if user_ids is not None:
+            stmt = stmt.where(role_user.c.user_id.in_(list(user_ids)))
+        if permission_ids is not None:
+            stmt = stmt.where(permission_role.c.permission_id.in_(list(permission_ids)))
+
+        await db.execute(
+            insert_ignore(user_effective_permissions).from_select(["user_id", "permission_id"], stmt)
+        )
+
+    async def _revoke_effective_permissions(
+        self,
+        db: AsyncSession,
+        role_id: Union[int, Iterable[int]],
+        user_ids: Optional[Iterable[int]] = None,
+        permission_ids: Optional[Iterable[int]] = None,
+        exclude_role: bool = False,
+    ):
+        """
+        Removes pairs that `role_id` (one id or several) may have granted, unless another
+        role of the user still grants the permission. `exclude_role` ignores the role
+        itself (used before deleting it). Pending ORM changes must be flushed.
+        """
+        uep = user_effective_permissions
+        role_ids = [role_id] if isinstance(role_id, int) else list(role_id)
+        if user_ids is None:
+            user_ids = select(role_user.c.user_id).where(role_user.c.role_id.in_(role_ids))
+        else:
+            user_ids = list(user_ids)
+        if permission_ids is None:
+            permission_ids = select(permission_role.c.permission_id).where(permission_role.c.role_id.in_(role_ids))
+        else:
+            permission_ids = list(permission_ids)
+
+        still_granted = (
+            select(role_user.c.user_id)
+            .select_from(role_user)
+            .join(permission_role, permission_role.c.role_id == role_user.c.role_id)
+            .where(
+                role_user.c.user_id == uep.c.user_id,
+                permission_role.c.permission_id == uep.c.permission_id,
+            )
+        )
+        if exclude_role:
+            still_granted = still_granted.where(role_user.c.role_id.not_in(role_ids))
+
+        await db.execute(
+            delete(uep).where(
+                uep.c.user_id.in_(user_ids),
+                uep.c.permission_id.in_(permission_ids),
+                ~exists(still_granted),
+            )
+        )
+
+    async def rebuild_effective_permissions(self, db: AsyncSession, batch_size: int = 5000) -> int:
+        """
+        Recomputes user_effective_permissions from role_user x permission_role,
+        in user id ranges of `batch_size` committed one at a time. Returns the number of users scanned.
+        """
+        uep = user_effective_permissions
+        last_id = 0
+        scanned = 0
+        while True:
+            result = await db.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                break
+            first_id, last_id = ids[0], ids[-1]
+            user_range = and_(uep.c.user_id >= first_id, uep.c.user_id <= last_id)
+            await db.execute(delete(uep).where(user_range))
+
+            granted = (
+                select(role_user.c.user_id, permission_role.c.permission_id)
+                .select_from(role_user)
+                .join(permission_role, permission_role.c.role_id == role_user.c.role_id)
+                .where(role_user.c.user_id >= first_id, role_user.c.user_id <= last_id)
+                .distinct()
+            )
+            await db.execute(insert_ignore(uep).from_select(["user_id", "permission_id"], granted))
+            await db.commit()
+            scanned += len(ids)
+        return scanned
+
+    async def user_has_permission(self, db: AsyncSession, user_id: int, perm_name: str) -> bool:
+        """Direct check against user_effective_permissions: a single primary-key lookup."""
+        snapshot = await rbac_graph.get_snapshot(db)
+        perm_id = snapshot.permission_ids.get(perm_name)
+        if perm_id is None:
+            return False
+        uep = user_effective_permissions
+        result = await db.execute(
+            select(uep.c.user_id).where(uep.c.user_id == user_id, uep.c.permission_id == perm_id)
+        )
+        return result.first() is not None
+
+    async def get_permission_by_name(self, db: AsyncSession, name: str):
+        result = await db.execute(select(Permission).filter(Permission.name == name))
+        return result.scalars().first()
+
+    async def _bump_version(self, db: AsyncSession):
+        """
+        Increments the shared RBAC version inside the caller's transaction,
+        so other workers rebuild their snapshot once the write is committed.
+        """
+        result = await db.execute(
+            update(RBACVersion)
+            .where(RBACVersion.id == RBAC_VERSION_ROW_ID)
+            .values(version=RBACVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            # Counter row missing (tables created outside Alembic), start it here
+            db.add(RBACVersion(id=RBAC_VERSION_ROW_ID, version=1))
+
+    def _invalidate(
+        self, user_id: Optional[int] = None, role_id: Optional[int] = None, user_ids: Optional[Iterable[int]] = None
+    ):
+        """Drops this worker's cached RBAC state touched by a committed write."""
+        if user_id is not None:
+            permission_cache.invalidate(user_id)
+        if user_ids is not None:
+            permission_cache.invalidate_users(user_ids)
+        if role_id is not None:
+            permission_cache.invalidate_role(role_id)
+        rbac_graph.invalidate()
+        response_cache.clear()
+        # Who holds which permission may have changed
+        count_cache.invalidate(prefix="users:permission:")
+
+    async def get_effective_permissions(self, db: AsyncSession, user_id: int) -> EffectivePermissions:
+        """
+        Flattened roles/permissions of a user, served from the per-worker cache.
+        On a miss only the user's role ids are read; permissions come from the compiled snapshot.
+        """
+        snapshot = await rbac_graph.get_snapshot(db)
+        cached = permission_cache.get(user_id)
+        if cached is not None and cached.rbac_version == snapshot.version:
+            return cached
+
+        generation = permission_cache.generation
+        stmt = (
+            select(Role.id, Role.name)
+            .select_from(role_user)
+            .join(Role, Role.id == role_user.c.role_id)
+            .where(role_user.c.user_id == user_id)
+        )
+        result = await db.execute(stmt)
+        effective = _compile_effective(result.all(), snapshot)
+        permission_cache.set(user_id, effective, generation=generation)
+        return effective
+
+    async def get_principal(self, db: AsyncSession, user_id: int) -> Optional[Principal]:
+        """
+        Loads the authenticated user as a lightweight Principal in a single query:
+        the bare user row on a permission-cache hit, otherwise the user row joined
+        with its roles. Permissions are resolved from the compiled RBAC snapshot.
+        """
+        snapshot = await rbac_graph.get_snapshot(db)
+        user_columns = (User.id, User.email, User.is_active, User.is_superuser)
+
+        cached = permission_cache.get(user_id)
+        if cached is not None and cached.rbac_version == snapshot.version:
+            result = await db.execute(select(*user_columns).where(User.id == user_id))
+            row = result.first()
+            if row is None:
+                return None
+            return Principal(*row, effective=cached)
+
+        generation = permission_cache.generation
+        stmt = (
+            select(*user_columns, Role.id, Role.name)
+            .select_from(User)
+            .outerjoin(role_user, role_user.c.user_id == User.id)
+            .outerjoin(Role, Role.id == role_user.c.role_id)
+            .where(User.id == user_id)
+        )
+        result = await db.execute(stmt)
+        rows = result.all()
+        if not rows:
+            return None
+
+        effective = _compile_effective((row[4:] for row in rows), snapshot)
+        permission_cache.set(user_id, effective, generation=generation)
+        return Principal(*rows[0][:4], effective=effective)
+
+
+def _compile_effective(rows, snapshot: RBACSnapshot) -> EffectivePermissions:
+    """Folds (role_id, role_name) rows into an EffectivePermissions using the snapshot's masks."""
+    role_ids, roles = set(), set()
+    for role_id, role_name in rows:
+        if role_id is None:
+            continue
+        role_ids.add(role_id)
+        roles.add(role_name)
+
+    mask = snapshot.roles_mask(role_ids)
+    return EffectivePermissions(
+        permissions=snapshot.names_for(mask),
+        roles=frozenset(roles),
+        role_ids=frozenset(role_ids),
+        permission_mask=mask,
+        rbac_version=snapshot.version,
+    )
+
 rbac_service = RBACService()
@@ -1,7 +1,17 @@
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only, noload, selectinload
+from typing import List, Optional
+from app.core.config import settings
+from app.core.count_cache import CountEntry, count_cache, count_table
+from app.core.database import insert_ignore
+from app.core.fieldsets import FieldSelection
+from app.core.hashing import password_hasher
+from app.models.rbac import Role, user_effective_permissions
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserUpdate, UserBulkResult
+from app.services.rbac_service import rbac_service
 
 class UserService:
     async def get_user_by_email(self, db: AsyncSession, email: str):
@@ -9,22 +19,193 @@ class UserService:
         return result.scalars().first()
 
     async def create_user(self, db: AsyncSession, user: UserCreate):
-        # In a real app, hash the password here
-        fake_hashed_password = user.password + "notreallyhashed"
         db_user = User(
             email=user.email,
-            hashed_password=fake_hashed_password,
+            hashed_password=await password_hasher.hash(user.password),
             full_name=user.full_name,
             is_active=user.is_active,
             is_superuser=user.is_superuser,
         )
         db.add(db_user)
         await db.commit()
+        count_cache.adjust("users", 1)
         await db.refresh(db_user)
         return db_user
 
-    async def get_users(self, db: AsyncSession, skip: int = 0, limit: int = 100):
-        result = await db.execute(select(User).offset(skip).limit(limit))
+    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[User]:
+        """
+        Returns the user when the password matches. Hashes made with older scrypt
+        parameters (or the legacy placeholder) are upgraded on the way.
+        """
+        user = await self.get_user_by_email(db, email)
+        if user is None:
+            return None
+        valid, needs_rehash = await password_hasher.verify(password, user.hashed_password)
+        if not valid:
+            return None
+        if needs_rehash:
+            user.hashed_password = await password_hasher.hash(password)
+            await db.commit()
+        return user
+
+    async def create_users_bulk(
+        self, db: AsyncSession, users: List[UserCreate], chunk_size: Optional[int] = None
+    ) -> List[UserBulkResult]:
+        """
+        Inserts users with multi-row INSERT IGNOREs of `chunk_size` rows, committed
+        per chunk; one SELECT of the chunk's emails then tells created rows from
+        emails that were already registered. Returns one result per input row,
+        in input order.
+        """
+        chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        results: List[Optional[UserBulkResult]] = [None] * len(users)
+
+        pending = []
+        seen_emails = set()
+        for index, user in enumerate(users):
+            # The unique index is case-insensitive on MySQL, so dedupe the same way
+            key = user.email.lower()
+            if key in seen_emails:
+                results[index] = UserBulkResult(
+                    index=index, email=user.email, status="duplicate", detail="Duplicate email in request"
+                )
+                continue
+            seen_emails.add(key)
+            pending.append((index, {
+                "email": user.email,
+                "full_name": user.full_name,
+                "is_active": user.is_active,
+                "is_superuser": user.is_superuser,
+            }))
+
+        # All hashes computed in parallel across the hashing pool
+        hashes = await password_hasher.hash_many([users[index].password for index, _ in pending])
+        for (_, row), hashed_password in zip(pending, hashes):
+            row["hashed_password"] = hashed_password
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            created = await self._insert_users_chunk(db, chunk, results)
+            count_cache.adjust("users", created)
+        return results
+
+    async def _insert_users_chunk(self, db: AsyncSession, chunk, results) -> int:
+        """Inserts and commits `chunk`, recording each row's outcome in `results`; returns the rows created."""
+        if not chunk:
+            return 0
+        await db.execute(insert_ignore(User.__table__), [row for _, row in chunk])
+        await db.commit()
+
+        # A row holding our freshly salted hash is ours; any other row under the email was already there
+        emails = [row["email"] for _, row in chunk]
+        stored = await db.execute(select(User.id, User.email, User.hashed_password).where(User.email.in_(emails)))
+        existing = {email.lower(): (user_id, hashed) for user_id, email, hashed in stored.all()}
+        created = 0
+        for index, row in chunk:
+            user_id, hashed = existing.get(row["email"].lower(), (None, None))
+            if hashed is not None and hashed == row["hashed_password"]:
+                results[index] = UserBulkResult(index=index, email=row["email"], id=user_id, status="created")
+                created += 1
+            elif user_id is not None:
+                results[index] = UserBulkResult(
+                    index=index, email=row["email"], status="duplicate", detail="Email already registered"
+                )
+            else:
+                results[index] = UserBulkResult(
+                    index=index, email=row["email"], status="error", detail="Row rejected by the database"
+                )
+        return created
+
+    async def count_users(self, db: AsyncSession, permission_id: Optional[int] = None) -> CountEntry:
+        """Total of the get_users listing (optionally filtered by permission), from the count cache."""
+        if permission_id is None:
+            return await count_cache.get("users", lambda: count_table(db, User.__table__))
+
+        async def count():
+            uep = user_effective_permissions
+            result = await db.execute(select(func.count()).where(uep.c.permission_id == permission_id))
+            return result.scalar_one(), False
+        return await count_cache.get(f"users:permission:{permission_id}", count)
+
+    async def get_users(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        permission_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        selection: Optional[FieldSelection] = None,
+    ):
+        """
+        Users ordered by id. With `after_id` (keyset pagination) the page starts right
+        after that id through the primary key index, otherwise `skip` rows are skipped.
+        `selection` narrows the loaded columns and relationships (see _user_load_options).
+        """
+        stmt = self._page(select(User).options(*self._user_load_options(selection)), skip, limit, permission_id, after_id)
+        result = await db.execute(stmt)
         return result.scalars().all()
 
+    async def get_user_rows(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        permission_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Same page as get_users, as plain dicts shaped like UserResponse (for
+        FastJSONResponse): narrow column SELECTs, no ORM objects.
+        """
+        columns = (User.email, User.is_active, User.is_superuser, User.full_name, User.id)
+        result = await db.execute(self._page(select(*columns), skip, limit, permission_id, after_id))
+        users = [
+            {"email": email, "is_active": is_active, "is_superuser": is_superuser, "full_name": full_name, "id": user_id}
+            for email, is_active, is_superuser, full_name, user_id in result.all()
+        ]
+        roles = await rbac_service.get_user_role_rows(db, [user["id"] for user in users])
+        for user in users:
+            user["roles"] = roles[user["id"]]
+        return users
+
+    def _page(self, stmt, skip: int, limit: int, permission_id: Optional[int], after_id: Optional[int]):
+        """Orders, filters and pages a users SELECT (see get_users)."""
+        if permission_id is not None:
+            # Index range scan on user_effective_permissions (permission_id, user_id)
+            uep = user_effective_permissions
+            stmt = (
+                stmt.join(uep, uep.c.user_id == User.id)
+                .where(uep.c.permission_id == permission_id)
+                .order_by(uep.c.user_id)
+            )
+            id_column = uep.c.user_id
+        else:
+            stmt = stmt.order_by(User.id)
+            id_column = User.id
+
+        if after_id is not None:
+            stmt = stmt.where(id_column > after_id)
+        else:
+            stmt = stmt.offset(skip)
+        return stmt.limit(limit)
+
+    def _user_load_options(self, selection: Optional[FieldSelection]):
+        """
+        Loader options for a user listing. Without a selection roles and their
+        permissions are loaded (full UserResponse); with one, only the requested
+        columns and relationships are. Role.users is never needed for a user listing.
+        """
+        if selection is None:
+            return [selectinload(User.roles).options(selectinload(Role.permissions), noload(Role.users))]
+
+        options = [load_only(*(getattr(User, name) for name in selection.fields))]
+        if "roles" in selection.include:
+            permissions_loader = (
+                selectinload(Role.permissions) if "roles.permissions" in selection.include else noload(Role.permissions)
+            )
+            options.append(selectinload(User.roles).options(permissions_loader, noload(Role.users)))
+        else:
+            options.append(noload(User.roles))
+        return options
+
 user_service = UserService()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import math
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+# (method, url, JSON body, raw bytes body or None) for the i-th request of a scenario
+RequestFactory = Callable[[int], Tuple[str, str, Optional[object]]]
+
+
+class Scenario(NamedTuple):
+    name: str
+    request: RequestFactory
+    expected_status: Tuple[int, ...] = (200,)
+    # Streamed body: queries run after the headers, so X-DB-Query-Count misses them
+    streamed: bool = False
+
+
+class ScenarioResult(NamedTuple):
+    name: str
+    concurrency: int
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+    queries: float  # average X-DB-Query-Count per request (/debug/sql totals for streamed scenarios)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.concurrency}"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+async def streamed_queries(
+    client: httpx.AsyncClient, sql_stats_url: str, method: str, path: str, requests: int
+) -> List[int]:
+    """
+    Statement counts of the latest `requests` requests to `path`, as recorded once
+    their body has been sent (GET /debug/sql). Scenarios run one after the other,
+    so right after a run these are that run's requests (or the most recent of them,
+    when SQL_STATS_HISTORY is smaller).
+    """
+    response = await client.get(sql_stats_url, params={"limit": requests})
+    response.raise_for_status()
+    entries = [
+        entry for entry in response.json()["requests"] if entry["method"] == method and entry["path"] == path
+    ]
+    return [entry["statements"] for entry in entries[:requests]]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    offset: int = 0,
+    sql_stats_url: Optional[str] = None,
+) -> ScenarioResult:
+    """
+    Sends `requests` requests from `concurrency` workers pulling from one counter,
+    so the level of concurrency stays fixed until the last request.
+    `offset` keeps request indexes unique across runs (unique emails, names...).
+    Query counts of streamed scenarios come from `sql_stats_url` (/debug/sql).
+    """
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    counter = iter(range(offset, offset + requests))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            method, url, body = scenario.request(index)
+            started = time.perf_counter()
+            if isinstance(body, bytes):
+                response = await client.request(method, url, content=body)
+            else:
+                response = await client.request(method, url, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code not in scenario.expected_status:
+                errors += 1
+            queries.append(int(response.headers.get("x-db-query-count", 0)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    if scenario.streamed and sql_stats_url:
+        method, url, _ = scenario.request(offset)
+        queries = await streamed_queries(client, sql_stats_url, method, urlsplit(url).path, requests)
+
+    latencies.sort()
+    return ScenarioResult(
+        name=scenario.name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        rps=round(len(latencies) / wall, 1) if wall else 0.0,
+        queries=round(sum(queries) / len(queries), 2) if queries else 0.0,
+    )
+
+
+def format_table(results: List[ScenarioResult]) -> str:
+    header = f"{'scenario':<34} {'conc':>4} {'req':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>9} {'q/req':>6}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<34} {r.concurrency:>4} {r.requests:>6} {r.errors:>4} {r.p50_ms:>9.2f} "
+            f"{r.p95_ms:>9.2f} {r.p99_ms:>9.2f} {r.rps:>9.1f} {r.queries:>6.1f}"
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(path: str, results: List[ScenarioResult], meta: dict) -> None:
+    data = {"meta": meta, "results": {r.key: r._asdict() for r in results}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    results: List[ScenarioResult], baseline: Dict[str, dict], tolerance: float, min_delta_ms: float = 1.0
+) -> List[str]:
+    """
+    Regressions against a baseline: p95 latency up (by more than `min_delta_ms`,
+    so sub-millisecond jitter is ignored) or throughput down by more than
+    `tolerance` (0.25 = 25 %), more queries per request (beyond the odd RBAC
+    version poll), more errors.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r.key)
+        if base is None:
+            continue
+        if r.errors > base["errors"]:
+            regressions.append(f"{r.key}: {r.errors} errors (baseline {base['errors']})")
+        if r.queries > base["queries"] * 1.1 + 0.5:
+            regressions.append(f"{r.key}: {r.queries} queries/request (baseline {base['queries']})")
+        if r.p95_ms > base["p95_ms"] * (1 + tolerance) and r.p95_ms - base["p95_ms"] > min_delta_ms:
+            regressions.append(f"{r.key}: p95 {r.p95_ms:.2f} ms (baseline {base['p95_ms']:.2f} ms)")
+        if base["rps"] and r.rps < base["rps"] * (1 - tolerance):
+            regressions.append(f"{r.key}: {r.rps:.1f} rps (baseline {base['rps']:.1f} rps)")
+    return regressions
@@ -0,0 +1,125 @@
+"""
+Endpoint benchmarks: the real app, in process, over httpx's ASGI transport.
+
+    python -m benchmarks.run                              # SQLite stand-in, default volumes
+    python -m benchmarks.run --users 20000 --concurrency 1,20,100 --only "users\\."
+    python -m benchmarks.run --save-baseline              # store results as the baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json   # exit 1 on regressions
+
+Runs against a throwaway SQLite file by default; --database-url points it at a
+local MySQL instead (the database is dropped and re-seeded).
+"""
+import argparse
+import asyncio
+import os
+import platform
+import re
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark every /api/v1 endpoint in process.")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--permissions", type=int, default=50)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and level")
+    parser.add_argument("--only", help="Regex on scenario names")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 / rps drift (0.25 = 25%%)")
+    return parser.parse_args()
+
+
+def configure_environment(args) -> str:
+    """Settings are read at import time, so this runs before anything from `app` is imported."""
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.db"
+    os.environ["DATABASE_REPLICA_URLS"] = "[]"
+    os.environ["SQL_INSTRUMENTATION"] = "true"  # X-DB-Query-Count
+    os.environ["SQL_STATS_HEADERS"] = "true"
+    os.environ["DEBUG_ENDPOINTS"] = "true"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("SQL_SLOW_QUERY_MS", "100000")
+    # Measure the endpoints rather than the KDF (set SCRYPT_N to bench hashing)
+    os.environ.setdefault("SCRYPT_N", "1024")
+    # logs/ is created in the working directory
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    return workdir
+
+
+async def main(args) -> int:
+    import httpx
+    from app.core.database import engine
+    from app.main import create_app
+    from benchmarks import harness, scenarios
+    from benchmarks.seed import Volumes, seed
+
+    volumes = Volumes(
+        users=args.users, roles=args.roles, permissions=args.permissions, products=args.products
+    )
+    levels = [int(level) for level in args.concurrency.split(",")]
+    selected = [
+        scenario for scenario in scenarios.build(volumes, args.requests)
+        if not args.only or re.search(args.only, scenario.name)
+    ]
+
+    print(f"Seeding {volumes} into {engine.url.render_as_string(hide_password=True)} ...")
+    await seed(volumes)
+
+    results = []
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for level_index, concurrency in enumerate(levels):
+                for scenario in selected:
+                    result = await harness.run_scenario(
+                        client, scenario, concurrency, args.requests, offset=level_index * args.requests,
+                        sql_stats_url=scenarios.SQL_STATS_URL,
+                    )
+                    results.append(result)
+                    print(f"  {result.key:<40} p95 {result.p95_ms:>8.2f} ms  {result.rps:>8.1f} rps")
+
+    print()
+    print(harness.format_table(results))
+
+    if args.save_baseline:
+        harness.save_baseline(args.baseline, results, meta={
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "database": engine.dialect.name,
+            "volumes": volumes._asdict(),
+            "requests": args.requests,
+        })
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline to compare with (run with --save-baseline first).")
+        return 0
+
+    regressions = harness.compare(results, harness.load_baseline(args.baseline), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} REGRESSION(S) against {args.baseline}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\nNo regression against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    arguments.baseline = os.path.abspath(arguments.baseline)
+    configure_environment(arguments)
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,104 @@
+import json
+from typing import List
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from benchmarks.harness import Scenario
+from benchmarks.seed import WORDS, Volumes
+
+API = settings.API_V1_STR
+# Statement totals of streamed responses (exports), see harness.streamed_queries
+SQL_STATS_URL = f"{API}/debug/sql"
+
+# Rows per products.import request
+IMPORT_ROWS = 100
+
+
+def build(volumes: Volumes, requests: int) -> List[Scenario]:
+    """
+    One scenario per /api/v1 endpoint (plus the main query variants), in run order:
+    writes that need rows created by an earlier scenario come after it.
+    `requests` is the number of requests per run, used to map a request index back
+    to the rows created by the matching run of an earlier scenario.
+    """
+    users, roles, permissions, products = volumes.users, volumes.roles, volumes.permissions, volumes.products
+
+    def user_id(i: int) -> int:
+        return i % users + 1
+
+    def role_id(i: int) -> int:
+        return i % roles + 1
+
+    def permission_names(i: int) -> List[str]:
+        first = i % permissions
+        return [f"perm.{(first + k) % permissions + 1}" for k in range(min(5, permissions))]
+
+    def import_rows(i: int) -> List[dict]:
+        # Upserts existing ids, so the catalog keeps its size across runs
+        return [
+            {"id": (i * IMPORT_ROWS + k) % max(products, 1) + 1, "name": f"{WORDS[(i + k) % len(WORDS)]} {i}-{k}",
+             "price": (i + k) % 500, "description": f"imported {WORDS[k % len(WORDS)]}"}
+            for k in range(IMPORT_ROWS)
+        ]
+
+    def import_ndjson(i: int) -> bytes:
+        return "".join(json.dumps(row) + "\n" for row in import_rows(i)).encode()
+
+    def import_csv(i: int) -> bytes:
+        lines = ["id,name,price,description"]
+        lines += [f"{row['id']},{row['name']},{row['price']},{row['description']}" for row in import_rows(i)]
+        return ("\n".join(lines) + "\n").encode()
+
+    return [
+        # Users
+        Scenario("users.list", lambda i: ("GET", f"{API}/users/?limit=50&skip={i * 50 % users}", None)),
+        Scenario("users.list.cursor", lambda i: (
+            "GET", f"{API}/users/?limit=50&cursor={encode_cursor(id=i * 50 % users)}", None)),
+        Scenario("users.list.sparse", lambda i: (
+            "GET", f"{API}/users/?limit=50&fields=id,email&include=roles&cursor={encode_cursor(id=i * 50 % users)}", None)),
+        Scenario("users.list.permission", lambda i: (
+            "GET", f"{API}/users/?limit=50&permission=perm.{i % permissions + 1}", None)),
+        Scenario("users.create", lambda i: (
+            "POST", f"{API}/users/", {"email": f"new{i}@example.com", "password": "secret", "full_name": f"New {i}"})),
+        Scenario("users.bulk", lambda i: ("POST", f"{API}/users/bulk", {"users": [
+            {"email": f"bulk{i}-{k}@example.com", "password": "secret"} for k in range(5)
+        ]})),
+        Scenario("users.roles.assign", lambda i: ("POST", f"{API}/users/{user_id(i)}/roles/{role_id(i)}", None)),
+        Scenario("users.roles.remove", lambda i: ("DELETE", f"{API}/users/{user_id(i)}/roles/{role_id(i)}", None)),
+        Scenario("users.roles.batch-assign", lambda i: ("POST", f"{API}/users/roles/batch-assign", {
+            "user_ids": [user_id(i * 100 + k) for k in range(100)], "role_ids": [role_id(i)],
+        })),
+        Scenario("users.roles.batch-revoke", lambda i: ("POST", f"{API}/users/roles/batch-revoke", {
+            "user_ids": [user_id(i * 100 + k) for k in range(100)], "role_ids": [role_id(i)],
+        })),
+        # Roles
+        Scenario("roles.list", lambda i: ("GET", f"{API}/roles/", None)),
+        Scenario("roles.list.page", lambda i: ("GET", f"{API}/roles/?limit=10&skip={i % roles}", None)),
+        Scenario("roles.get", lambda i: ("GET", f"{API}/roles/{role_id(i)}", None)),
+        Scenario("roles.users", lambda i: ("GET", f"{API}/roles/{role_id(i)}/users?limit=50", None)),
+        Scenario("roles.create", lambda i: (
+            "POST", f"{API}/roles/", {"name": f"bench-{i}", "permissions": permission_names(i)})),
+        Scenario("roles.update", lambda i: (
+            "PUT", f"{API}/roles/{role_id(i)}", {"name": f"role-{role_id(i)}", "permissions": permission_names(i)})),
+        # Deletes the roles created by the roles.create run of the same level
+        Scenario("roles.delete", lambda i: ("DELETE", f"{API}/roles/{roles + 1 + i % requests}", None)),
+        # Products
+        Scenario("products.search", lambda i: (
+            "GET", f"{API}/products/search?q={WORDS[i % len(WORDS)]}+{WORDS[(i * 7) % len(WORDS)]}", None)),
+        Scenario("products.search.price", lambda i: (
+            "GET", f"{API}/products/search?q={WORDS[i % len(WORDS)]}&min_price={i % 400}&max_price={i % 400 + 50}", None)),
+        Scenario("products.import", lambda i: ("POST", f"{API}/products/import", import_ndjson(i))),
+        Scenario("products.import.csv", lambda i: ("POST", f"{API}/products/import?format=csv", import_csv(i))),
+        # Exports (streamed: query counts come from /debug/sql)
+        Scenario("export.users", lambda i: ("GET", f"{API}/export/users", None), streamed=True),
+        Scenario("export.roles", lambda i: ("GET", f"{API}/export/roles?format=csv", None), streamed=True),
+        Scenario("export.role-users", lambda i: ("GET", f"{API}/export/role-users", None), streamed=True),
+        Scenario("export.role-permissions", lambda i: ("GET", f"{API}/export/role-permissions", None), streamed=True),
+        # Debug
+        Scenario("debug.sql", lambda i: ("GET", f"{API}/debug/sql?limit=5", None)),
+        Scenario("debug.logging", lambda i: ("GET", f"{API}/debug/logging", None)),
+        Scenario("debug.pool", lambda i: ("GET", f"{API}/debug/pool", None)),
+        Scenario("debug.hashing", lambda i: ("GET", f"{API}/debug/hashing", None)),
+        Scenario("debug.response-cache", lambda i: ("GET", f"{API}/debug/response-cache", None)),
+        Scenario("debug.counts", lambda i: ("GET", f"{API}/debug/counts", None)),
+    ]
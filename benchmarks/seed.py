@@ -0,0 +1,87 @@
+import random
+from typing import NamedTuple
+
+from sqlalchemy import insert
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.hashing import LEGACY_SUFFIX
+from app.models.product import Product
+from app.models.rbac import Permission, RBACVersion, Role, permission_role, role_user
+from app.models.user import User
+from app.core.rbac_graph import RBAC_VERSION_ROW_ID
+from app.services.rbac_service import rbac_service
+
+
+class Volumes(NamedTuple):
+    users: int = 2000
+    roles: int = 20
+    permissions: int = 50
+    roles_per_user: int = 2
+    permissions_per_role: int = 10
+    products: int = 5000
+
+
+# Product names / descriptions are drawn from these words (product search scenarios)
+WORDS = (
+    "red blue green black white leather cotton wool steel wooden running walking winter summer "
+    "shoe boot jacket shirt lamp chair table desk bottle bag watch phone cable charger"
+).split()
+
+
+async def seed(volumes: Volumes, chunk_size: int = 5000, rng_seed: int = 42) -> None:
+    """
+    Creates the schema and fills it with `volumes`, using multi-row INSERTs.
+    Passwords use the legacy placeholder format so seeding does not pay for scrypt.
+    """
+    rng = random.Random(rng_seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def insert_chunked(db, table, rows):
+        for start in range(0, len(rows), chunk_size):
+            await db.execute(insert(table), rows[start:start + chunk_size])
+
+    async with SessionLocal() as db:
+        await db.execute(insert(RBACVersion), [{"id": RBAC_VERSION_ROW_ID, "version": 0}])
+        await insert_chunked(db, Permission.__table__, [
+            {"id": i, "name": f"perm.{i}", "description": f"Permission {i}"}
+            for i in range(1, volumes.permissions + 1)
+        ])
+        await insert_chunked(db, Role.__table__, [
+            {"id": i, "name": f"role-{i}", "description": f"Role {i}"} for i in range(1, volumes.roles + 1)
+        ])
+        permission_ids = list(range(1, volumes.permissions + 1))
+        await insert_chunked(db, permission_role, [
+            {"role_id": role_id, "permission_id": perm_id}
+            for role_id in range(1, volumes.roles + 1)
+            for perm_id in rng.sample(permission_ids, min(volumes.permissions_per_role, volumes.permissions))
+        ])
+        await insert_chunked(db, User.__table__, [
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "full_name": f"User {i}",
+                "hashed_password": "secret" + LEGACY_SUFFIX,
+                "is_active": True,
+                "is_superuser": False,
+            }
+            for i in range(1, volumes.users + 1)
+        ])
+        role_ids = list(range(1, volumes.roles + 1))
+        await insert_chunked(db, role_user, [
+            {"user_id": user_id, "role_id": role_id}
+            for user_id in range(1, volumes.users + 1)
+            for role_id in rng.sample(role_ids, min(volumes.roles_per_user, volumes.roles))
+        ])
+        await insert_chunked(db, Product.__table__, [
+            {
+                "id": i,
+                "name": " ".join(rng.sample(WORDS, 3)),
+                "price": round(rng.uniform(1, 500), 2),
+                "description": " ".join(rng.sample(WORDS, 8)),
+            }
+            for i in range(1, volumes.products + 1)
+        ])
+        await db.commit()
+        await rbac_service.rebuild_effective_permissions(db)
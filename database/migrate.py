@@ -2,7 +2,6 @@ import asyncio
 import os
 import sys
 import subprocess
-from sqlalchemy import text
 
 # Add parent directory (project root) to sys.path to allow imports from 'app'
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -11,7 +10,9 @@ from app.core.database import engine
 from app.core.config import settings
 
 async def run_sql_file(file_path: str):
-    """Executes a raw SQL file using SQLAlchemy."""
+    """Executes a raw SQL file, streamed statement by statement (see database/sql_loader.py)."""
+    from database.sql_loader import load_sql_file
+
     base_dir = os.path.dirname(__file__)
     # Path relative to project root
     full_path = os.path.abspath(os.path.join(base_dir, "..", file_path))
@@ -21,14 +22,17 @@ async def run_sql_file(file_path: str):
         return
 
     print(f"Executing SQL: {full_path}...")
-    with open(full_path, "r", encoding="utf-8") as f:
-        sql = f.read()
-
-    async with engine.begin() as conn:
-        for statement in sql.split(";"):
-            if statement.strip():
-                await conn.execute(text(statement))
-    print(f"Finished SQL: {file_path}")
+    result = await load_sql_file(
+        engine,
+        full_path,
+        batch_size=settings.SQL_LOAD_BATCH_SIZE,
+        commit_every=settings.SQL_LOAD_COMMIT_EVERY,
+        disable_checks=settings.SQL_LOAD_DISABLE_CHECKS,
+    )
+    print(
+        f"Finished SQL: {file_path} ({result.statements} statements, {result.rows} rows "
+        f"in {result.seconds:.1f}s, {result.rows / max(result.seconds, 1e-9):.0f} rows/s)"
+    )
 
 def run_alembic():
     """Runs alembic upgrade head from project root."""
@@ -41,33 +45,42 @@ def run_alembic():
         return False
     return True
 
-async def run_seeders():
-    """Runs all python scripts in database/seeders/."""
-    base_dir = os.path.dirname(__file__)
-    seeder_dir = os.path.join(base_dir, "seeders")
-    if not os.path.exists(seeder_dir):
-        return
+async def run_seeders(force: bool = False):
+    """Runs database/seeders/* in dependency order, skipping those already applied (see database/seeding.py)."""
+    from database.seeding import run_seeders as run_seeder_levels
 
     print("Running Seeders...")
-    import importlib.util
-
-    for filename in os.listdir(seeder_dir):
-        if filename.endswith(".py") and not filename.startswith("__"):
-            file_path = os.path.join(seeder_dir, filename)
-            module_name = f"database.seeders.{filename[:-3]}"
-            
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            if hasattr(module, "run"):
-                print(f"   Executing seeder: {filename}")
-                if asyncio.iscoroutinefunction(module.run):
-                    await module.run()
-                else:
-                    module.run()
+    await run_seeder_levels(force=force)
     print("Seeders Finished")
 
+async def backfill_effective_permissions():
+    """Rebuilds user_effective_permissions from role assignments (after upgrading an existing DB)."""
+    from app.core.database import SessionLocal
+    from app.services.rbac_service import rbac_service
+
+    print("Backfilling user_effective_permissions...")
+    async with SessionLocal() as db:
+        scanned = await rbac_service.rebuild_effective_permissions(db)
+    print(f"Backfill Finished ({scanned} users)")
+
+async def import_products(file_path: str):
+    """Streams a CSV / NDJSON product file (format from the extension) into `products`."""
+    from app.core.database import SessionLocal
+    from app.core.ingest import iter_file
+    from app.schemas.product import ImportFormat
+    from app.services.product_service import product_service
+
+    format = ImportFormat.csv if file_path.lower().endswith(".csv") else ImportFormat.ndjson
+    print(f"Importing products from {file_path} ({format.value})...")
+    async with SessionLocal() as db:
+        report = await product_service.import_products(db, iter_file(file_path), format)
+    for error in report.errors:
+        print(f"   Row {error.row}: {error.detail}")
+    print(
+        f"Import Finished ({report.imported} imported, {report.failed} failed of {report.rows} rows "
+        f"in {report.seconds:.1f}s, {report.rows_per_second:.0f} rows/s)"
+    )
+
 async def create_db():
     import aiomysql
     # Parse connection string
@@ -103,7 +116,19 @@ async def main():
             await run_sql_file("database/sql/data.sql")
     
     elif command == "seed":
-        await run_seeders()
+        # --force re-runs seeders whose source did not change
+        await run_seeders(force="--force" in sys.argv)
+
+    elif command == "backfill":
+        await backfill_effective_permissions()
+
+    elif command == "load" and len(sys.argv) > 2:
+        # Large fixture / restore files: python database/migrate.py load path/to/dump.sql
+        await run_sql_file(sys.argv[2])
+
+    elif command == "import-products" and len(sys.argv) > 2:
+        # Supplier catalogs: python database/migrate.py import-products catalog.csv
+        await import_products(sys.argv[2])
         
     elif command == "all":
         await run_sql_file("database/sql/schema.sql")
@@ -112,7 +137,7 @@ async def main():
             await run_seeders()
     
     else:
-        print("Usage: python database/migrate.py [up|seed|all]")
+        print("Usage: python database/migrate.py [up|seed [--force]|backfill|all|load <file.sql>|import-products <file.csv|file.ndjson>]")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,27 +1,48 @@
-from app.core.database import SessionLocal
-from app.services.rbac_service import rbac_service
-from app.schemas.rbac import RoleCreate, PermissionCreate
-from app.models.rbac import Role, Permission
+from sqlalchemy import true
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-async def run():
-    async with SessionLocal() as db:
-        print("   -> Seeding Permissions & Roles...")
-        
-        # Permissions
-        p_view_users = await rbac_service.create_permission(db, PermissionCreate(name="users.view", description="View users"))
-        p_edit_users = await rbac_service.create_permission(db, PermissionCreate(name="users.edit", description="Edit users"))
-        p_delete_users = await rbac_service.create_permission(db, PermissionCreate(name="users.delete", description="Delete users"))
-        
-        # Roles
-        admin_role = await rbac_service.create_role(db, RoleCreate(name="admin", description="Administrator", permissions=["users.view", "users.edit", "users.delete"]))
-        
-        # Manual link in case creation didn't Link (just for safety in seeder)
-        admin = (await db.execute(select(Role).filter(Role.name == "admin"))).scalars().first()
-        permissions = [p_view_users, p_edit_users, p_delete_users]
-        for p in permissions:
-            if p not in admin.permissions:
-                admin.permissions.append(p)
-        
-        await db.commit()
-        print("   -> Seeding Complete!")
+from app.core.database import insert_ignore
+from app.models.rbac import Role, Permission, permission_role
+from app.services.rbac_service import rbac_service
+from database.seeding import upsert
+
+# Seeders this one needs (file names without .py)
+DEPENDS_ON = []
+
+PERMISSIONS = [
+    {"name": "users.view", "description": "View users"},
+    {"name": "users.edit", "description": "Edit users"},
+    {"name": "users.delete", "description": "Delete users"},
+]
+
+ROLES = [
+    {"name": "admin", "description": "Administrator", "permissions": ["users.view", "users.edit", "users.delete"]},
+]
+
+async def run(db: AsyncSession):
+    print("   -> Seeding Permissions & Roles...")
+
+    # Permissions / roles: one upsert each, re-runs only refresh descriptions
+    await upsert(db, Permission.__table__, PERMISSIONS, key=["name"], update=["description"])
+    await upsert(
+        db,
+        Role.__table__,
+        [{"name": role["name"], "description": role["description"]} for role in ROLES],
+        key=["name"],
+        update=["description"],
+    )
+
+    # Role <-> permission links by name, existing ones are skipped
+    for role in ROLES:
+        pairs = (
+            select(Permission.id, Role.id)
+            .select_from(Permission)
+            .join(Role, true())
+            .where(Permission.name.in_(role["permissions"]), Role.name == role["name"])
+        )
+        await db.execute(insert_ignore(permission_role).from_select(["permission_id", "role_id"], pairs))
+
+    role_ids = (await db.execute(select(Role.id).where(Role.name.in_([role["name"] for role in ROLES])))).scalars().all()
+    await rbac_service.sync_after_bulk_write(db, role_ids)
+    print("   -> Seeding Complete!")
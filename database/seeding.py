@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Sequence
+
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, upsert
+from app.models.seeder import SeederRun
+
+SEEDER_DIR = os.path.join(os.path.dirname(__file__), "seeders")
+
+
+class Seeder(NamedTuple):
+    name: str
+    path: str
+    module: object
+    depends_on: Sequence[str]
+
+
+def discover(seeder_dir: str = SEEDER_DIR) -> Dict[str, Seeder]:
+    """Seeder modules of `seeder_dir`: a `run([db])` coroutine and an optional `DEPENDS_ON` list of seeder names."""
+    seeders = {}
+    for filename in sorted(os.listdir(seeder_dir)):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        name = filename[:-3]
+        path = os.path.join(seeder_dir, filename)
+        spec = importlib.util.spec_from_file_location(f"database.seeders.{name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if hasattr(module, "run"):
+            seeders[name] = Seeder(name, path, module, tuple(getattr(module, "DEPENDS_ON", ())))
+    return seeders
+
+
+def levels(seeders: Dict[str, Seeder]) -> List[List[str]]:
+    """Groups seeders so each one comes after its dependencies; a level has no internal dependency."""
+    for seeder in seeders.values():
+        unknown = [dep for dep in seeder.depends_on if dep not in seeders]
+        if unknown:
+            raise ValueError(f"Seeder {seeder.name} depends on unknown seeder(s): {', '.join(unknown)}")
+
+    remaining = dict(seeders)
+    done = set()
+    result = []
+    while remaining:
+        level = sorted(name for name, seeder in remaining.items() if set(seeder.depends_on) <= done)
+        if not level:
+            raise ValueError(f"Seeder dependency cycle between: {', '.join(sorted(remaining))}")
+        result.append(level)
+        done.update(level)
+        for name in level:
+            del remaining[name]
+    return result
+
+
+def checksums(seeders: Dict[str, Seeder], order: List[List[str]]) -> Dict[str, str]:
+    """Hash of each seeder's source and of its dependencies' hashes: changing a seeder re-runs its dependents."""
+    result = {}
+    for level in order:
+        for name in level:
+            digest = hashlib.sha256()
+            with open(seeders[name].path, "rb") as f:
+                digest.update(f.read())
+            for dep in sorted(seeders[name].depends_on):
+                digest.update(result[dep].encode())
+            result[name] = digest.hexdigest()
+    return result
+
+
+async def _run_one(seeder: Seeder, checksum: str) -> float:
+    started = time.perf_counter()
+    run = seeder.module.run
+    async with SessionLocal() as db:
+        if inspect.signature(run).parameters:
+            await run(db)
+        else:
+            # Legacy seeder managing its own session
+            result = run()
+            if inspect.isawaitable(result):
+                await result
+        await upsert(
+            db,
+            SeederRun.__table__,
+            [{"name": seeder.name, "checksum": checksum, "ran_at": datetime.now(timezone.utc)}],
+            key=["name"],
+            update=["checksum", "ran_at"],
+        )
+        await db.commit()
+    return time.perf_counter() - started
+
+
+async def run_seeders(force: bool = False, seeder_dir: str = SEEDER_DIR) -> None:
+    """
+    Runs the seeders level by level, the seeders of a level concurrently (at most
+    SEEDER_CONCURRENCY at once, each with its own session). Seeders already applied
+    with the same checksum are skipped unless `force`.
+    """
+    seeders = discover(seeder_dir)
+    order = levels(seeders)
+    sums = checksums(seeders, order)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: SeederRun.__table__.create(sync_conn, checkfirst=True))
+    async with SessionLocal() as db:
+        applied = dict((await db.execute(select(SeederRun.name, SeederRun.checksum))).all())
+
+    slots = asyncio.Semaphore(settings.SEEDER_CONCURRENCY)
+
+    async def guarded(name: str) -> None:
+        async with slots:
+            seconds = await _run_one(seeders[name], sums[name])
+        print(f"   Seeder {name} done in {seconds:.2f}s")
+
+    for level in order:
+        pending = [name for name in level if force or applied.get(name) != sums[name]]
+        for name in level:
+            if name not in pending:
+                print(f"   Seeder {name} up to date, skipped")
+        if pending:
+            print(f"   Executing seeder(s): {', '.join(pending)}")
+            await asyncio.gather(*(guarded(name) for name in pending))
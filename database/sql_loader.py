@@ -0,0 +1,260 @@
+import asyncio
+import codecs
+import os
+import re
+import time
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+# `DELIMITER $$` on a line of its own (mysql client directive, never sent to the server)
+_DELIMITER_LINE = re.compile(r"[ \t]*DELIMITER[ \t]+(\S+)[ \t]*\r?\n", re.IGNORECASE)
+
+# Where a quoted string / identifier ends: backslash escapes are skipped, doubled quotes handled by the caller
+_QUOTE_END = {
+    "'": re.compile(r"\\.|'", re.DOTALL),
+    '"': re.compile(r'\\.|"', re.DOTALL),
+    "`": re.compile(r"`"),
+}
+
+
+class SQLStatementSplitter:
+    """
+    Incremental SQL tokenizer: feed() text chunks, get back complete statements.
+    Delimiters inside quotes, backticks and comments are ignored, `--` / `#`
+    comments are dropped, `/* ... */` comments are kept (MySQL `/*!...*/` hints
+    are executable) and `DELIMITER` lines change the statement terminator.
+    Only whole lines are scanned, so no token is ever cut by a chunk boundary.
+    """
+
+    def __init__(self, delimiter: str = ";"):
+        self._tail = ""
+        self._parts: List[str] = []
+        self._blank = True
+        self._state: Optional[str] = None  # open quote char or "/*"
+        self._set_delimiter(delimiter)
+
+    def _set_delimiter(self, delimiter: str) -> None:
+        self.delimiter = delimiter
+        self._special = re.compile(r"""['"`#\n]|--(?=[ \t\r\n])|/\*|""" + re.escape(delimiter))
+
+    def feed(self, chunk: str) -> List[str]:
+        data = self._tail + chunk
+        cut = data.rfind("\n") + 1
+        self._tail = data[cut:]
+        return self._scan(data[:cut]) if cut else []
+
+    def close(self) -> List[str]:
+        """Flushes the last statement, even without a trailing delimiter."""
+        statements = self._scan(self._tail + "\n") if self._tail else []
+        self._tail = ""
+        last = self._take()
+        if last:
+            statements.append(last)
+        return statements
+
+    def _append(self, piece: str) -> None:
+        if piece:
+            self._parts.append(piece)
+            if self._blank and not piece.isspace():
+                self._blank = False
+
+    def _take(self) -> Optional[str]:
+        statement = "".join(self._parts).strip() if not self._blank else ""
+        self._parts = []
+        self._blank = True
+        return statement or None
+
+    def _scan(self, text: str) -> List[str]:
+        statements = []
+        i, n = 0, len(text)
+        line_start = True
+        while i < n:
+            if self._state is not None:
+                i = self._scan_open(text, i)
+                continue
+
+            if line_start and self._blank:
+                match = _DELIMITER_LINE.match(text, i)
+                if match:
+                    self._set_delimiter(match.group(1))
+                    i = match.end()
+                    continue
+            line_start = False
+
+            match = self._special.search(text, i)
+            if match is None:
+                self._append(text[i:])
+                break
+            token = match.group()
+            self._append(text[i:match.start()])
+            i = match.end()
+
+            if token == "\n":
+                self._append("\n")
+                line_start = True
+            elif token in ("--", "#"):
+                # Line comment: dropped, the newline is handled on the next turn
+                i = text.find("\n", i)
+                i = n if i < 0 else i
+            elif token == self.delimiter:
+                statement = self._take()
+                if statement:
+                    statements.append(statement)
+            else:
+                # Opening quote, backtick or block comment
+                self._append(token)
+                self._state = token
+        return statements
+
+    def _scan_open(self, text: str, i: int) -> int:
+        """Consumes text inside a quote / block comment, returns the next position."""
+        if self._state == "/*":
+            end = text.find("*/", i)
+            if end < 0:
+                self._append(text[i:])
+                return len(text)
+            self._append(text[i:end + 2])
+            self._state = None
+            return end + 2
+
+        quote = self._state
+        pattern = _QUOTE_END[quote]
+        while True:
+            match = pattern.search(text, i)
+            if match is None:
+                self._append(text[i:])
+                return len(text)
+            end = match.end()
+            if match.group() == quote:
+                if text.startswith(quote, end):
+                    # Doubled quote is an escaped quote
+                    self._append(text[i:end + 1])
+                    i = end + 1
+                    continue
+                self._append(text[i:end])
+                self._state = None
+                return end
+            self._append(text[i:end])
+            i = end
+
+
+def iter_statements(path: str, chunk_size: int = 1 << 20, progress: Optional[Callable[[int], None]] = None) -> Iterator[str]:
+    """
+    Streams the statements of a SQL file, reading `chunk_size` bytes at a time.
+    `progress` is called with the number of bytes read so far.
+    """
+    splitter = SQLStatementSplitter()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    bytes_read = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            statements = splitter.feed(decoder.decode(chunk))
+            if progress:
+                progress(bytes_read)
+            yield from statements
+    yield from splitter.feed(decoder.decode(b"", final=True))
+    yield from splitter.close()
+
+
+class LoadResult(NamedTuple):
+    statements: int
+    rows: int
+    bytes: int
+    seconds: float
+
+
+class _Progress:
+    """Throttled progress lines: bytes read, statements, rows and rows/s."""
+
+    def __init__(self, total_bytes: int, interval: float, report: Callable[[str], None]):
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.report = report
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.bytes = 0
+        self.statements = 0
+        self.rows = 0
+
+    def read(self, bytes_read: int) -> None:
+        self.bytes = bytes_read
+
+    def tick(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self.last < self.interval:
+            return
+        self.last = now
+        elapsed = max(now - self.started, 1e-9)
+        percent = self.bytes / self.total_bytes * 100 if self.total_bytes else 100.0
+        self.report(
+            f"   {self.bytes / 1048576:.1f}/{self.total_bytes / 1048576:.1f} MB ({percent:.0f}%) - "
+            f"{self.statements} statements, {self.rows} rows, {self.rows / elapsed:.0f} rows/s"
+        )
+
+
+async def load_sql_file(
+    engine,
+    path: str,
+    batch_size: int = 500,
+    commit_every: int = 5000,
+    disable_checks: bool = False,
+    progress_interval: float = 5.0,
+    report: Callable[[str], None] = print,
+) -> LoadResult:
+    """
+    Executes a (possibly huge) SQL file with constant memory.
+    Statements are parsed `batch_size` at a time in a worker thread while the
+    previous batch runs, and committed every `commit_every` statements.
+    Statements go to the driver as-is (no bind parameter parsing, so `:` and `%`
+    in data are safe). `disable_checks` turns off MySQL foreign key / unique
+    checks for the session, like mysqldump output does.
+    """
+    progress = _Progress(os.path.getsize(path), progress_interval, report)
+    statements = iter_statements(path, progress=progress.read)
+
+    def next_batch() -> List[str]:
+        batch = []
+        for statement in statements:
+            batch.append(statement)
+            if len(batch) >= batch_size:
+                break
+        return batch
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(no_parameters=True)
+        if disable_checks and engine.dialect.name == "mysql":
+            await conn.exec_driver_sql("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+
+        uncommitted = 0
+        pending = asyncio.ensure_future(asyncio.to_thread(next_batch))
+        while True:
+            batch = await pending
+            if not batch:
+                break
+            # Parse the next batch while this one executes
+            pending = asyncio.ensure_future(asyncio.to_thread(next_batch))
+            for statement in batch:
+                result = await conn.exec_driver_sql(statement)
+                if result.rowcount > 0:
+                    progress.rows += result.rowcount
+            progress.statements += len(batch)
+            uncommitted += len(batch)
+            if uncommitted >= commit_every:
+                await conn.commit()
+                uncommitted = 0
+            progress.tick()
+        await conn.commit()
+
+        if disable_checks and engine.dialect.name == "mysql":
+            await conn.exec_driver_sql("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+    progress.tick(force=True)
+    return LoadResult(
+        statements=progress.statements,
+        rows=progress.rows,
+        bytes=progress.bytes,
+        seconds=time.perf_counter() - progress.started,
+    )
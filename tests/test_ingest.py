@@ -0,0 +1,38 @@
+from app.core.ingest import RecordParser
+
+
+def parse(data: bytes, csv_format: bool = True, chunk_size: int = 1 << 20, **options):
+    parser = RecordParser(csv_format, **options)
+    records = []
+    for start in range(0, len(data), chunk_size):
+        records += parser.feed(data[start:start + chunk_size])
+    return records + parser.feed(b"", final=True)
+
+
+def test_csv_with_byte_order_mark():
+    data = "\ufeffname,price\nLamp,7.25\n".encode("utf-8")
+    for chunk_size in (1, 2, 1 << 20):
+        records = parse(data, chunk_size=chunk_size)
+        assert [(r.row, r.data, r.error) for r in records] == [(1, {"name": "Lamp", "price": "7.25"}, None)]
+
+
+def test_ndjson_with_byte_order_mark():
+    records = parse('\ufeff{"name": "Lamp"}\n'.encode("utf-8"), csv_format=False)
+    assert [(r.data, r.error) for r in records] == [({"name": "Lamp"}, None)]
+
+
+def test_quote_inside_unquoted_field_is_literal():
+    data = b'name,description\n12" pipe,"multi\nline, ""quoted"""\nnext,x\n'
+    for chunk_size in (1, 3, 1 << 20):
+        records = parse(data, chunk_size=chunk_size)
+        assert [r.data for r in records] == [
+            {"name": '12" pipe', "description": 'multi\nline, "quoted"'},
+            {"name": "next", "description": "x"},
+        ]
+
+
+def test_oversized_record_is_a_row_error():
+    data = b'name,description\n"unterminated,' + b"x" * 100 + b"\nok,fine\n"
+    records = parse(data, chunk_size=7, max_record_size=50)
+    assert records[0].error == "Record longer than 50 characters"
+    assert records[1].data == {"name": "ok", "description": "fine"}